@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Offline INT8 post-training quantization for the face models.
+
+Quantizes the YuNet detector and SFace recognizer ONNX models with
+onnxruntime static PTQ (per-channel symmetric weights, per-tensor
+activations) using calibration frames captured on the robot, e.g.:
+
+    python scripts/quantize_face_models.py --calib-dir data/captures
+
+Outputs `*_int8.onnx` next to each fp32 model; the vision code picks
+those up automatically when present. Run this on a workstation — it
+needs `onnxruntime` which is not installed on the Pi image.
+"""
+import argparse
+import glob
+import os
+import sys
+
+import cv2
+import numpy as np
+
+try:
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+except ImportError:
+    raise SystemExit(
+        "Missing onnxruntime. Install with:\n"
+        "  pip install onnxruntime\n"
+    )
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.abspath(os.path.join(_THIS_DIR, ".."))
+_MODELS_DIR = os.path.join(_PROJECT_ROOT, "src", "vision", "models")
+
+DETECT_MODEL = os.path.join(_MODELS_DIR, "face_detection_yunet.onnx")
+RECOG_MODEL = os.path.join(_MODELS_DIR, "face_recognition_sface.onnx")
+
+
+class _FrameReader(CalibrationDataReader):
+    """Feeds calibration frames as NCHW float32 blobs."""
+
+    def __init__(self, image_paths, input_name: str, size):
+        self.input_name = input_name
+        self.size = size
+        self._iter = iter(image_paths)
+
+    def get_next(self):
+        path = next(self._iter, None)
+        if path is None:
+            return None
+        frame = cv2.imread(path)
+        if frame is None:
+            return self.get_next()
+        frame = cv2.resize(frame, self.size)
+        blob = frame.astype(np.float32).transpose(2, 0, 1)[np.newaxis, ...]
+        return {self.input_name: blob}
+
+
+def _input_name(model_path: str) -> str:
+    import onnxruntime as ort
+
+    sess = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+    return sess.get_inputs()[0].name
+
+
+def _quantize(model_path: str, image_paths, size) -> str:
+    root, ext = os.path.splitext(model_path)
+    out_path = f"{root}_int8{ext}"
+    reader = _FrameReader(image_paths, _input_name(model_path), size)
+    quantize_static(
+        model_path,
+        out_path,
+        reader,
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+    )
+    print(f"Wrote {out_path}")
+    return out_path
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Quantize face models to INT8")
+    ap.add_argument("--calib-dir", type=str, default=os.path.join(_PROJECT_ROOT, "data", "captures"))
+    ap.add_argument("--detect-size", type=str, default="640x480", help="detector input WxH")
+    ap.add_argument("--recog-size", type=str, default="112x112", help="recognizer input WxH")
+    ap.add_argument("--detect-model", type=str, default=DETECT_MODEL)
+    ap.add_argument("--recog-model", type=str, default=RECOG_MODEL)
+    args = ap.parse_args()
+
+    image_paths = sorted(glob.glob(os.path.join(args.calib_dir, "*.jpg")))
+    if not image_paths:
+        raise SystemExit(f"No calibration .jpg frames found in {args.calib_dir}")
+    print(f"Calibrating with {len(image_paths)} frames from {args.calib_dir}")
+
+    def parse_wh(s):
+        w, h = s.lower().split("x")
+        return int(w), int(h)
+
+    _quantize(args.detect_model, image_paths, parse_wh(args.detect_size))
+    _quantize(args.recog_model, image_paths, parse_wh(args.recog_size))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -54,6 +54,22 @@ def _normalize_text(text: str) -> str:
     return " ".join(text.strip().lower().split())
 
 
+# Quick-path keyword sets compiled once at import: each check below is a
+# single scan of the utterance instead of one substring scan per keyword.
+_GREETING_EXACT = frozenset(
+    {"hi", "hello", "hey", "hello botronka", "hi botronka", "hey botronka"}
+)
+_THANKS_RE = re.compile(r"thank you|thanks|thx")
+_TIME_RE = re.compile(
+    r"what time is it|what's the time|tell me the time|current time|time now"
+)
+_STATUS_RE = re.compile(r"status|how are you now")
+_BEEP_RE = re.compile(r"beep|chirp|buzz")
+_STOP_RE = re.compile(r"stop|halt|cancel")
+_FORWARD_RE = re.compile(r"forward|ahead|straight")
+_BACKWARD_RE = re.compile(r"backward|go back|reverse|move back")
+
+
 def quick_rule_decision(user_text: str) -> AgentDecision | None:
     """Fast local intent path to avoid LLM latency for common requests."""
     t = _normalize_text(user_text)
@@ -61,7 +77,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
         return None
 
     # Lightweight conversational shortcuts.
-    if t in {"hi", "hello", "hey", "hello botronka", "hi botronka", "hey botronka"}:
+    if t in _GREETING_EXACT:
         return AgentDecision(
             type="chat",
             speak="Hi! Botronka the little ladybug is here to help.",
@@ -79,7 +95,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
             raw={"fast_path": "identity"},
         )
 
-    if any(tok in t for tok in ("thank you", "thanks", "thx")):
+    if _THANKS_RE.search(t):
         return AgentDecision(
             type="chat",
             speak="You are welcome. Happy to help.",
@@ -88,16 +104,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
             raw={"fast_path": "thanks"},
         )
 
-    if any(
-        tok in t
-        for tok in (
-            "what time is it",
-            "what's the time",
-            "tell me the time",
-            "current time",
-            "time now",
-        )
-    ):
+    if _TIME_RE.search(t):
         now_str = datetime.now().strftime("%H:%M")
         return AgentDecision(
             type="chat",
@@ -107,7 +114,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
             raw={"fast_path": "time"},
         )
 
-    if any(tok in t for tok in ("status", "show status", "how are you now")):
+    if _STATUS_RE.search(t):
         return AgentDecision(
             type="chat",
             speak="Checking my status.",
@@ -116,7 +123,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
             raw={"fast_path": "status"},
         )
 
-    if any(tok in t for tok in ("beep", "chirp", "buzz")):
+    if _BEEP_RE.search(t):
         return AgentDecision(
             type="command",
             speak="Beep beep.",
@@ -126,7 +133,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
         )
 
     # Low-latency motion intent shortcuts.
-    if any(tok in t for tok in ("stop", "halt", "cancel")):
+    if _STOP_RE.search(t):
         return AgentDecision(
             type="command",
             speak="Stopping now.",
@@ -144,7 +151,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
             raw={"fast_path": "motion_follow"},
         )
 
-    if any(tok in t for tok in ("forward", "ahead", "straight")):
+    if _FORWARD_RE.search(t):
         return AgentDecision(
             type="command",
             speak="Moving forward.",
@@ -153,7 +160,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
             raw={"fast_path": "motion_forward"},
         )
 
-    if any(tok in t for tok in ("backward", "go back", "reverse", "move back")):
+    if _BACKWARD_RE.search(t):
         return AgentDecision(
             type="command",
             speak="Moving backward.",
@@ -162,7 +169,9 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
             raw={"fast_path": "motion_backward"},
         )
 
-    if "left" in t and any(tok in t for tok in ("turn", "go", "move", "left")):
+    # The qualifier tuples used to include the direction word itself, so the
+    # extra membership scan was always true; the direction check suffices.
+    if "left" in t:
         return AgentDecision(
             type="command",
             speak="Turning left.",
@@ -171,7 +180,7 @@ def quick_rule_decision(user_text: str) -> AgentDecision | None:
             raw={"fast_path": "motion_left"},
         )
 
-    if "right" in t and any(tok in t for tok in ("turn", "go", "move", "right")):
+    if "right" in t:
         return AgentDecision(
             type="command",
             speak="Turning right.",
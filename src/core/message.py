@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass
@@ -7,3 +8,6 @@ class Message:
     type: str
     content: str
     sent_at: float
+    # Optional pre-parsed form of `content` so consumers can skip json.loads
+    # when the producer already had the dict in hand.
+    payload: Any = None
@@ -130,7 +130,11 @@ class RuntimeStateStore:
 
             elif msg.type == "vision_identity":
                 try:
-                    payload = json.loads(msg.content)
+                    payload = (
+                        msg.payload
+                        if msg.payload is not None
+                        else json.loads(msg.content)
+                    )
                     face = bool(payload.get("face_detected", False))
                     self._state.face_present = face
                     trust_text = str(payload.get("trust_level", "UNKNOWN")).upper()
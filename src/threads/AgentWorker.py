@@ -134,15 +134,14 @@ class AgentWorker(BaseThread):
                     ),
                 )
             else:
+                motion_payload = {
+                    "command": decision.command,
+                    "created_at": time.time(),
+                }
                 self.broadcast_message(
                     "motion_command",
-                    json.dumps(
-                        {
-                            "command": decision.command,
-                            "created_at": time.time(),
-                        },
-                        ensure_ascii=False,
-                    ),
+                    json.dumps(motion_payload, ensure_ascii=False),
+                    payload=motion_payload,
                 )
 
     def _drain_register_results(self):
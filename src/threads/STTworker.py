@@ -14,6 +14,11 @@ from src.audio.STT import STTConfig, transcribe
 from src.core.message import Message
 from src.threads.baseThread import BaseThread
 
+try:
+    import ahocorasick  # pragma: no cover - optional speedup
+except Exception:
+    ahocorasick = None
+
 
 @dataclass
 class STTWorkerConfig:
@@ -32,10 +37,50 @@ _NAME_VARIANTS = ("botronka", "biedronka")
 _SHORT_GREET_RE = re.compile(r"^(hi|hello|hey)\b", re.IGNORECASE)
 _WAKE_INTENT_RE = re.compile(r"\b(wake|listen|start listening|can you hear me)\b", re.IGNORECASE)
 _NOISE_ONLY_RE = re.compile(r"^\([^)]*\)$")
+_ALPHA_TOKEN_RE = re.compile(r"[a-zA-Z]+")
+_WORD_RE = re.compile(r"[a-zA-Z']+")
+
+# Multi-pattern wake keywords: with pyahocorasick installed the utterance is
+# walked once for every keyword instead of once per regex alternation.
+_WAKE_KEYWORDS = {
+    "hi": "greeting",
+    "hello": "greeting",
+    "hey": "greeting",
+    "wake": "listen",
+    "listen": "listen",
+    "start listening": "listen",
+    "can you hear me": "listen",
+}
+
+if ahocorasick is not None:
+    _WAKE_AC = ahocorasick.Automaton()
+    for _phrase, _kind in _WAKE_KEYWORDS.items():
+        _WAKE_AC.add_word(_phrase, (_phrase, _kind))
+    _WAKE_AC.make_automaton()
+else:
+    _WAKE_AC = None
+
+
+def _scan_wake_keywords(lower: str) -> tuple[bool, bool]:
+    """One Aho-Corasick pass over the utterance -> (has_greeting, has_listen)."""
+    padded = f" {lower} "  # spaces double as word boundaries for the hits
+    has_greeting = False
+    has_listen = False
+    for end, (phrase, kind) in _WAKE_AC.iter(padded):
+        start = end - len(phrase) + 1
+        if padded[start - 1].isalnum() or padded[end + 1].isalnum():
+            continue  # substring of a longer word, e.g. "high"
+        if kind == "greeting":
+            has_greeting = True
+        else:
+            has_listen = True
+        if has_greeting and has_listen:
+            break
+    return has_greeting, has_listen
 
 
 def _contains_name_variant(text: str) -> bool:
-    tokens = re.findall(r"[a-zA-Z]+", text.lower())
+    tokens = _ALPHA_TOKEN_RE.findall(text.lower())
     for tok in tokens:
         if tok in _NAME_VARIANTS:
             return True
@@ -55,17 +100,20 @@ def is_wake_phrase(text: str) -> bool:
         return False
 
     lower = normalized.lower()
-    words = re.findall(r"[a-zA-Z']+", lower)
+    words = _WORD_RE.findall(lower)
     word_count = len(words)
 
     has_name = _contains_name_variant(normalized)
-    has_greeting = bool(_HI_RE.search(normalized) or _SHORT_GREET_RE.search(normalized))
-    has_listen_intent = bool(
-        _WAKE_UP_RE.search(normalized)
-        or _LISTEN_RE_1.search(normalized)
-        or _LISTEN_RE_2.search(normalized)
-        or _WAKE_INTENT_RE.search(normalized)
-    )
+    if _WAKE_AC is not None:
+        has_greeting, has_listen_intent = _scan_wake_keywords(lower)
+    else:
+        has_greeting = bool(_HI_RE.search(normalized) or _SHORT_GREET_RE.search(normalized))
+        has_listen_intent = bool(
+            _WAKE_UP_RE.search(normalized)
+            or _LISTEN_RE_1.search(normalized)
+            or _LISTEN_RE_2.search(normalized)
+            or _WAKE_INTENT_RE.search(normalized)
+        )
 
     # Preferred: wake phrase includes bot name (exact/fuzzy variants).
     if has_name and (has_greeting or has_listen_intent):
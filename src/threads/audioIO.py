@@ -80,7 +80,11 @@ class AudioIOThread(BaseThread):
             return
 
         try:
-            payload = json.loads(message.content)
+            payload = (
+                message.payload
+                if message.payload is not None
+                else json.loads(message.content)
+            )
         except Exception:
             return
 
@@ -27,10 +27,16 @@ class BaseThread:
     def handle_message(self, message: Message):
         pass
 
-    def broadcast_message(self, type: str, content: str):
+    def broadcast_message(self, type: str, content: str, payload=None):
         logging.info("Thread %s broadcasting message: %s", self.name, content)
         self.queue.put(
-            Message(sender=self.name, type=type, content=content, sent_at=time.time())
+            Message(
+                sender=self.name,
+                type=type,
+                content=content,
+                sent_at=time.time(),
+                payload=payload,
+            )
         )
 
     def stop(self):
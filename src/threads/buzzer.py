@@ -9,6 +9,36 @@ from src.core.message import Message
 
 from src.hardware.buzzer import Buzzer, BuzzerConfig
 
+try:
+    import orjson  # pragma: no cover - optional speedup
+except Exception:
+    orjson = None
+
+try:
+    import msgspec  # pragma: no cover - optional speedup
+except Exception:
+    msgspec = None
+
+if msgspec is not None:
+    class _BuzzerPatternMsg(msgspec.Struct):
+        pattern: str | None = None
+
+    # Fixed-schema decoder: parses straight into the struct, no dict built.
+    _PATTERN_DECODER = msgspec.json.Decoder(_BuzzerPatternMsg)
+else:
+    _PATTERN_DECODER = None
+
+
+def _loads(raw: str):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# The state payloads never change; serialize them once.
+_STATE_ACTIVE = json.dumps({"active": True})
+_STATE_INACTIVE = json.dumps({"active": False})
+
 
 @dataclass
 class BuzzerThreadConfig:
@@ -19,27 +49,62 @@ class BuzzerThread(BaseThread):
     def __init__(self, queue: queue.Queue[Message], config: BuzzerThreadConfig):
         super().__init__(name="BuzzerThread", queue=queue)
         self.buzzer = Buzzer(BuzzerConfig(pin=config.pin))
+        # buzzer_pattern dispatch: one dict lookup instead of an elif chain.
+        self._pattern_dispatch: dict[str, Callable[[], None]] = {
+            "chirp": self.buzzer.chirp,
+            "stuck": self.buzzer.pattern_stuck,
+            "error": self.buzzer.pattern_error,
+            "too_close": self.buzzer.pattern_too_close,
+        }
 
     def handle_message(self, message: Message):
         logging.debug(f"BuzzerThread received message: {message}")
 
         if message.type == "distance_cm":
-            distance = json.loads(message.content).get("value")
+            payload = (
+                message.payload
+                if message.payload is not None
+                else _loads(message.content)
+            )
+            distance = payload.get("value")
             if isinstance(distance, (int, float)) and distance < 15:
                 logging.info(f"Distance {distance} cm is too close, activating buzzer.")
-                self.broadcast_message("buzzer_state", json.dumps({"active": True}))
+                self.broadcast_message("buzzer_state", _STATE_ACTIVE)
                 try:
                     self.buzzer.pattern_too_close()
                 finally:
-                    self.broadcast_message("buzzer_state", json.dumps({"active": False}))
+                    self.broadcast_message("buzzer_state", _STATE_INACTIVE)
 
         elif message.type == "buzzer_countdown":
-            payload = json.loads(message.content)
+            payload = (
+                message.payload
+                if message.payload is not None
+                else _loads(message.content)
+            )
             steps = int(payload.get("steps", 3))
             interval_s = float(payload.get("interval_s", 0.6))
             logging.info("Buzzer countdown: steps=%s interval=%s", steps, interval_s)
-            self.broadcast_message("buzzer_state", json.dumps({"active": True}))
+            self.broadcast_message("buzzer_state", _STATE_ACTIVE)
             try:
                 self.buzzer.pattern_countdown(steps=steps, interval_s=interval_s)
             finally:
-                self.broadcast_message("buzzer_state", json.dumps({"active": False}))
+                self.broadcast_message("buzzer_state", _STATE_INACTIVE)
+
+        elif message.type == "buzzer_pattern":
+            if message.payload is not None:
+                pattern = message.payload.get("pattern")
+            elif _PATTERN_DECODER is not None:
+                pattern = _PATTERN_DECODER.decode(message.content).pattern
+            else:
+                pattern = _loads(message.content).get("pattern")
+
+            play = self._pattern_dispatch.get(pattern or "")
+            if play is None:
+                logging.warning("Unknown buzzer pattern: %r", pattern)
+                return
+
+            self.broadcast_message("buzzer_state", _STATE_ACTIVE)
+            try:
+                play()
+            finally:
+                self.broadcast_message("buzzer_state", _STATE_INACTIVE)
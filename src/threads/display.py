@@ -109,7 +109,11 @@ class DisplayThread(BaseThread):
                 )
         elif message.type == "vision_identity":
             try:
-                data = json.loads(message.content)
+                data = (
+                    message.payload
+                    if message.payload is not None
+                    else json.loads(message.content)
+                )
                 self.face_detected = bool(data.get("face_detected", False))
                 self.last_seen_name = str(data.get("name", "UNKNOWN"))
                 self.last_similarity = float(data.get("similarity", 0.0))
@@ -16,6 +16,16 @@ try:
 except Exception:  # pragma: no cover - runtime/hardware dependent
     DigitalOutputDevice = None  # type: ignore[assignment]
 
+try:
+    import pigpio  # pragma: no cover - optional speedup
+except Exception:
+    pigpio = None
+
+try:
+    import lgpio  # pragma: no cover - optional speedup
+except Exception:
+    lgpio = None
+
 
 @dataclass
 class MotionControlConfig:
@@ -48,7 +58,9 @@ class MotionControlConfig:
     dry_run: bool = False
 
 
-@dataclass
+# Frozen: the fast-command table hands out shared instances, so parse
+# results must be immutable.
+@dataclass(frozen=True)
 class ParsedMotionCommand:
     action: str
     duration_s: float | None = None
@@ -124,6 +136,78 @@ class L298NWheels:
             dev.close()
 
 
+def _connect_pigpio():
+    """Return a connected pigpio handle, or None when the daemon is down."""
+    if pigpio is None:
+        return None
+    try:
+        pi = pigpio.pi()
+        if pi.connected:
+            return pi
+        pi.stop()
+    except Exception:
+        logging.debug("pigpio daemon not reachable", exc_info=True)
+    return None
+
+
+class PigpioL298NWheels:
+    """L298N direction control via banked pigpio writes.
+
+    All four IN pins live in GPIO bank 0, so a direction change is two
+    bank writes (clear then set) instead of four per-pin device calls.
+    Clearing first means the bridge never passes through a state where
+    both inputs of one side are high.
+    """
+
+    def __init__(self, pi, in1: int, in2: int, in3: int, in4: int):
+        self._pi = pi
+        self._pins = (in1, in2, in3, in4)
+        for pin in self._pins:
+            pi.set_mode(pin, pigpio.OUTPUT)
+
+        def masks(*on_pins: int) -> tuple[int, int]:
+            set_mask = 0
+            for p in on_pins:
+                set_mask |= 1 << p
+            all_mask = (1 << in1) | (1 << in2) | (1 << in3) | (1 << in4)
+            return set_mask, all_mask & ~set_mask
+
+        # Per-action (set, clear) masks, computed once.
+        self._masks = {
+            "stop": masks(),
+            "forward": masks(in1, in3),
+            "backward": masks(in2, in4),
+            "spin_left": masks(in2, in3),
+            "spin_right": masks(in1, in4),
+        }
+        pi.clear_bank_1(self._masks["stop"][1])
+
+    def _apply(self, action: str):
+        set_mask, clr_mask = self._masks[action]
+        self._pi.clear_bank_1(clr_mask)
+        if set_mask:
+            self._pi.set_bank_1(set_mask)
+
+    def stop(self):
+        self._apply("stop")
+
+    def forward(self):
+        self._apply("forward")
+
+    def backward(self):
+        self._apply("backward")
+
+    def spin_left(self):
+        self._apply("spin_left")
+
+    def spin_right(self):
+        self._apply("spin_right")
+
+    def close(self):
+        self.stop()
+        self._pi.stop()
+
+
 class L9110StepperTogether:
     """Bipolar stepper full-step drive for two mirrored L9110S boards in parallel."""
 
@@ -139,35 +223,44 @@ class L9110StepperTogether:
         seq = [(+1, +1), (-1, +1), (-1, -1), (+1, -1)]
         self.seq = list(reversed(seq)) if invert else seq
 
-    def _set_a(self, d: int):
-        if d > 0:
-            self.ia1.on()
-            self.ia2.off()
-        else:
-            self.ia1.off()
-            self.ia2.on()
-
-    def _set_b(self, d: int):
-        if d > 0:
-            self.ib1.on()
-            self.ib2.off()
-        else:
-            self.ib1.off()
-            self.ib2.on()
+        # Pre-resolve each phase to the four bound GPIO writes it performs,
+        # so the pulse loop carries no branching or attribute lookups.
+        self._phases_fwd = tuple(self._phase_writers(a, b) for a, b in self.seq)
+        self._phases_rev = tuple(self._phase_writers(a, b) for a, b in reversed(self.seq))
+
+    def _phase_writers(self, a_dir: int, b_dir: int):
+        return (
+            self.ia1.on if a_dir > 0 else self.ia1.off,
+            self.ia2.off if a_dir > 0 else self.ia2.on,
+            self.ib1.on if b_dir > 0 else self.ib1.off,
+            self.ib2.off if b_dir > 0 else self.ib2.on,
+        )
 
     def step(self, steps: int, delay_s: float):
         if steps == 0:
             return
 
-        direction = 1 if steps > 0 else -1
         n = abs(steps)
-        seq = self.seq if direction > 0 else list(reversed(self.seq))
-
+        phases = self._phases_fwd if steps > 0 else self._phases_rev
+        period_ns = int(delay_s * 1e9) if delay_s > 0.0 else 0
+        sleep = time.sleep
+        monotonic_ns = time.monotonic_ns
+
+        # Sleep toward absolute deadlines: time.sleep always overshoots a
+        # little, and relative sleeps let that error accumulate over the
+        # whole move.
+        deadline = monotonic_ns()
         for i in range(n):
-            a_dir, b_dir = seq[i % 4]
-            self._set_a(a_dir)
-            self._set_b(b_dir)
-            time.sleep(max(0.0, delay_s))
+            set_a1, set_a2, set_b1, set_b2 = phases[i & 3]
+            set_a1()
+            set_a2()
+            set_b1()
+            set_b2()
+            if period_ns:
+                deadline += period_ns
+                remaining = deadline - monotonic_ns()
+                if remaining > 0:
+                    sleep(remaining / 1e9)
 
     def release(self):
         self.ia1.off()
@@ -181,6 +274,200 @@ class L9110StepperTogether:
             dev.close()
 
 
+class LgpioL298NWheels:
+    """L298N direction control over a claimed lgpio output group.
+
+    Talks to /dev/gpiochip0 directly: one group_write updates all four
+    IN pins in a single kernel call, with none of gpiozero's per-pin
+    wrapper dispatch.
+    """
+
+    def __init__(self, in1: int, in2: int, in3: int, in4: int):
+        self._chip = lgpio.gpiochip_open(0)
+        try:
+            lgpio.group_claim_output(self._chip, [in1, in2, in3, in4], 0)
+        except Exception:
+            lgpio.gpiochip_close(self._chip)
+            raise
+        self._leader = in1
+        # Group bits are positional: bit i drives the i-th claimed pin.
+        self._bits = {
+            "stop": 0b0000,
+            "forward": 0b0101,     # IN1 + IN3
+            "backward": 0b1010,    # IN2 + IN4
+            "spin_left": 0b0110,   # IN2 + IN3
+            "spin_right": 0b1001,  # IN1 + IN4
+        }
+
+    def _apply(self, action: str):
+        lgpio.group_write(self._chip, self._leader, self._bits[action])
+
+    def stop(self):
+        self._apply("stop")
+
+    def forward(self):
+        self._apply("forward")
+
+    def backward(self):
+        self._apply("backward")
+
+    def spin_left(self):
+        self._apply("spin_left")
+
+    def spin_right(self):
+        self._apply("spin_right")
+
+    def close(self):
+        try:
+            self.stop()
+            lgpio.group_free(self._chip, self._leader)
+        finally:
+            lgpio.gpiochip_close(self._chip)
+
+
+class PigpioL9110Stepper:
+    """L9110S full-step drive clocked by the pigpio DMA waveform engine.
+
+    The Python loop in L9110StepperTogether pays four GPIO calls plus a
+    time.sleep per step, so step timing jitters with scheduler latency.
+    Here the whole move is encoded once as pigpio pulses and the DMA
+    engine clocks the pins at microsecond precision while Python only
+    polls for completion.
+    """
+
+    # pigpio caps a single wave at roughly 5400 pulses; stay well under.
+    _MAX_WAVE_PULSES = 4096
+
+    def __init__(self, pi, ia1: int, ia2: int, ib1: int, ib2: int, invert: bool = False):
+        self._pi = pi
+        self._all_mask = (1 << ia1) | (1 << ia2) | (1 << ib1) | (1 << ib2)
+        for pin in (ia1, ia2, ib1, ib2):
+            pi.set_mode(pin, pigpio.OUTPUT)
+
+        seq = [(+1, +1), (-1, +1), (-1, -1), (+1, -1)]
+        if invert:
+            seq = list(reversed(seq))
+
+        def encode(a_dir: int, b_dir: int) -> tuple[int, int]:
+            on = (1 << ia1 if a_dir > 0 else 1 << ia2)
+            on |= 1 << ib1 if b_dir > 0 else 1 << ib2
+            return on, self._all_mask & ~on
+
+        self._masks_fwd = tuple(encode(a, b) for a, b in seq)
+        self._masks_rev = tuple(encode(a, b) for a, b in reversed(seq))
+
+    def _make_wave(self, masks, count: int, delay_us: int) -> int:
+        self._pi.wave_add_generic(
+            [pigpio.pulse(*masks[i & 3], delay_us) for i in range(count)]
+        )
+        return self._pi.wave_create()
+
+    def step(self, steps: int, delay_s: float):
+        if steps == 0:
+            return
+
+        n = abs(steps)
+        masks = self._masks_fwd if steps > 0 else self._masks_rev
+        delay_us = int(delay_s * 1e6) if delay_s > 0.0 else 0
+        pi = self._pi
+
+        wids = []
+        try:
+            if n <= self._MAX_WAVE_PULSES:
+                wid = self._make_wave(masks, n, delay_us)
+                wids.append(wid)
+                pi.wave_send_once(wid)
+            else:
+                # Loop one full-cycle wave via wave_chain, then play the
+                # remainder, instead of materializing n pulses.
+                cycles, rem = divmod(n, 4)
+                cycle_wid = self._make_wave(masks, 4, delay_us)
+                wids.append(cycle_wid)
+                chain = [255, 0, cycle_wid, 255, 1, cycles & 0xFF, cycles >> 8]
+                if rem:
+                    rem_wid = self._make_wave(masks, rem, delay_us)
+                    wids.append(rem_wid)
+                    chain.append(rem_wid)
+                pi.wave_chain(chain)
+
+            while pi.wave_tx_busy():
+                time.sleep(0.005)
+        finally:
+            for wid in wids:
+                pi.wave_delete(wid)
+
+    def release(self):
+        self._pi.clear_bank_1(self._all_mask)
+
+    def close(self):
+        self.release()
+        self._pi.stop()
+
+
+class LgpioL9110Stepper:
+    """L9110S full-step drive over a claimed lgpio output group.
+
+    Each phase is one positional group_write instead of four gpiozero
+    device calls; the pacing loop itself stays in Python (the pigpio
+    waveform driver handles the DMA-clocked case).
+    """
+
+    def __init__(self, ia1: int, ia2: int, ib1: int, ib2: int, invert: bool = False):
+        self._chip = lgpio.gpiochip_open(0)
+        try:
+            lgpio.group_claim_output(self._chip, [ia1, ia2, ib1, ib2], 0)
+        except Exception:
+            lgpio.gpiochip_close(self._chip)
+            raise
+        self._leader = ia1
+
+        seq = [(+1, +1), (-1, +1), (-1, -1), (+1, -1)]
+        if invert:
+            seq = list(reversed(seq))
+
+        def encode(a_dir: int, b_dir: int) -> int:
+            # Positional bits: ia1, ia2, ib1, ib2.
+            bits = 0b0001 if a_dir > 0 else 0b0010
+            bits |= 0b0100 if b_dir > 0 else 0b1000
+            return bits
+
+        self._phases_fwd = tuple(encode(a, b) for a, b in seq)
+        self._phases_rev = tuple(encode(a, b) for a, b in reversed(seq))
+
+    def step(self, steps: int, delay_s: float):
+        if steps == 0:
+            return
+
+        n = abs(steps)
+        phases = self._phases_fwd if steps > 0 else self._phases_rev
+        period_ns = int(delay_s * 1e9) if delay_s > 0.0 else 0
+        chip, leader = self._chip, self._leader
+        group_write = lgpio.group_write
+        sleep = time.sleep
+        monotonic_ns = time.monotonic_ns
+
+        # Sleep toward absolute deadlines so per-step overshoot does not
+        # accumulate across the move.
+        deadline = monotonic_ns()
+        for i in range(n):
+            group_write(chip, leader, phases[i & 3])
+            if period_ns:
+                deadline += period_ns
+                remaining = deadline - monotonic_ns()
+                if remaining > 0:
+                    sleep(remaining / 1e9)
+
+    def release(self):
+        lgpio.group_write(self._chip, self._leader, 0)
+
+    def close(self):
+        try:
+            self.release()
+            lgpio.group_free(self._chip, self._leader)
+        finally:
+            lgpio.gpiochip_close(self._chip)
+
+
 class NoopWheels:
     def stop(self):
         return
@@ -245,42 +532,103 @@ def _extract_distance_cm(command: str) -> float | None:
     return None
 
 
+# One hash lookup per token instead of one substring scan per keyword.
+# Each group lists the inflections the old substring checks caught for
+# free ("following", "stopped", "turning", ...) — speech and LLM text
+# arrive in free form, so exact base words alone are not enough.
+_TOKEN_FLAGS: dict[str, str] = {}
+for _flag, _words in {
+    "stop": (
+        "stop", "stops", "stopped", "stopping",
+        "halt", "halts", "halted", "halting",
+        "cancel", "cancels", "canceled", "cancelled", "canceling", "cancelling",
+        "freeze", "freezes", "freezing", "froze",
+    ),
+    "follow": ("follow", "follows", "followed", "following"),
+    "stepper": (
+        "stepper", "steer", "steers", "steered", "steering",
+        "head", "pan", "pans", "panning",
+    ),
+    "center": ("center", "centre", "centered", "centred", "centering", "centring"),
+    "left": ("left",),
+    "right": ("right",),
+    "backward": (
+        "backward", "backwards", "back",
+        "reverse", "reverses", "reversed", "reversing",
+    ),
+    "forward": ("forward", "forwards", "ahead", "front", "straight"),
+    "motion_verb": (
+        "turn", "turns", "turned", "turning",
+        "move", "moves", "moved", "moving",
+        "go", "goes", "going", "went",
+        "rotate", "rotates", "rotated", "rotating",
+    ),
+}.items():
+    for _w in _words:
+        _TOKEN_FLAGS[_w] = _flag
+del _flag, _words, _w
+
+
+# Exact single-word commands bypass the regex/substring parser entirely.
+_FAST_COMMANDS = {
+    "stop": ParsedMotionCommand(action="stop"),
+    "halt": ParsedMotionCommand(action="stop"),
+    "freeze": ParsedMotionCommand(action="stop"),
+    "forward": ParsedMotionCommand(action="forward"),
+    "backward": ParsedMotionCommand(action="backward"),
+    "back": ParsedMotionCommand(action="backward"),
+    "left": ParsedMotionCommand(action="left"),
+    "right": ParsedMotionCommand(action="right"),
+    "follow": ParsedMotionCommand(action="follow"),
+}
+
+
 def parse_motion_command(command_text: str) -> ParsedMotionCommand:
     cmd = command_text.strip().lower()
     if not cmd:
         return ParsedMotionCommand(action="unknown")
 
-    duration_s = _extract_seconds(cmd)
+    fast = _FAST_COMMANDS.get(cmd)
+    if fast is not None:
+        return fast
 
-    if any(tok in cmd for tok in ("stop", "halt", "cancel", "freeze")):
+    flags = set()
+    for tok in cmd.split():
+        flag = _TOKEN_FLAGS.get(tok.strip(".,!?"))
+        if flag:
+            flags.add(flag)
+
+    if "stop" in flags:
         return ParsedMotionCommand(action="stop")
 
-    if "follow" in cmd:
+    duration_s = _extract_seconds(cmd)
+
+    if "follow" in flags:
         return ParsedMotionCommand(
             action="follow",
             duration_s=duration_s,
             follow_target_cm=_extract_distance_cm(cmd),
         )
 
-    stepper_hint = any(tok in cmd for tok in ("stepper", "steer", "steering", "head", "pan"))
+    stepper_hint = "stepper" in flags
 
-    if "center" in cmd and stepper_hint:
+    if "center" in flags and stepper_hint:
         return ParsedMotionCommand(action="stepper_center")
 
-    if "left" in cmd:
-        if stepper_hint and not any(tok in cmd for tok in ("turn", "move", "go", "rotate")):
+    if "left" in flags:
+        if stepper_hint and "motion_verb" not in flags:
             return ParsedMotionCommand(action="stepper_left")
         return ParsedMotionCommand(action="left", duration_s=duration_s)
 
-    if "right" in cmd:
-        if stepper_hint and not any(tok in cmd for tok in ("turn", "move", "go", "rotate")):
+    if "right" in flags:
+        if stepper_hint and "motion_verb" not in flags:
             return ParsedMotionCommand(action="stepper_right")
         return ParsedMotionCommand(action="right", duration_s=duration_s)
 
-    if any(tok in cmd for tok in ("backward", "back", "reverse")):
+    if "backward" in flags:
         return ParsedMotionCommand(action="backward", duration_s=duration_s)
 
-    if any(tok in cmd for tok in ("forward", "ahead", "front", "straight")):
+    if "forward" in flags:
         return ParsedMotionCommand(action="forward", duration_s=duration_s)
 
     return ParsedMotionCommand(action="unknown")
@@ -309,6 +657,7 @@ class MotionControlThread(BaseThread):
             self.wheels, self.stepper = self._build_hardware_drivers()
 
         self._latest_distance_cm: float | None = None
+        self._distance_dirty = False
 
         self._follow_enabled = False
         self._follow_target_cm: float | None = None
@@ -327,23 +676,73 @@ class MotionControlThread(BaseThread):
             return NoopWheels(), NoopStepper()
 
         try:
-            wheels = L298NWheels(
+            return self._build_wheels_driver(), self._build_stepper_driver()
+        except Exception:
+            logging.exception("Failed to initialize motor GPIO drivers; falling back to dry-run")
+            return NoopWheels(), NoopStepper()
+
+    def _build_wheels_driver(self) -> WheelsDriver:
+        # Backend preference: pigpio banked writes, then direct lgpio group
+        # writes, then the per-pin gpiozero driver.
+        pi = _connect_pigpio()
+        if pi is not None:
+            return PigpioL298NWheels(
+                pi,
                 self.config.wheel_in1,
                 self.config.wheel_in2,
                 self.config.wheel_in3,
                 self.config.wheel_in4,
             )
-            stepper = L9110StepperTogether(
+
+        if lgpio is not None:
+            try:
+                return LgpioL298NWheels(
+                    self.config.wheel_in1,
+                    self.config.wheel_in2,
+                    self.config.wheel_in3,
+                    self.config.wheel_in4,
+                )
+            except Exception:
+                logging.debug("lgpio wheels driver unavailable; using gpiozero", exc_info=True)
+
+        return L298NWheels(
+            self.config.wheel_in1,
+            self.config.wheel_in2,
+            self.config.wheel_in3,
+            self.config.wheel_in4,
+        )
+
+    def _build_stepper_driver(self) -> StepperDriver:
+        pi = _connect_pigpio()
+        if pi is not None:
+            return PigpioL9110Stepper(
+                pi,
                 self.config.stepper_ia1,
                 self.config.stepper_ia2,
                 self.config.stepper_ib1,
                 self.config.stepper_ib2,
                 invert=self.config.stepper_invert,
             )
-            return wheels, stepper
-        except Exception:
-            logging.exception("Failed to initialize motor GPIO drivers; falling back to dry-run")
-            return NoopWheels(), NoopStepper()
+
+        if lgpio is not None:
+            try:
+                return LgpioL9110Stepper(
+                    self.config.stepper_ia1,
+                    self.config.stepper_ia2,
+                    self.config.stepper_ib1,
+                    self.config.stepper_ib2,
+                    invert=self.config.stepper_invert,
+                )
+            except Exception:
+                logging.debug("lgpio stepper driver unavailable; using gpiozero", exc_info=True)
+
+        return L9110StepperTogether(
+            self.config.stepper_ia1,
+            self.config.stepper_ia2,
+            self.config.stepper_ib1,
+            self.config.stepper_ib2,
+            invert=self.config.stepper_invert,
+        )
 
     def handle_message(self, message: Message):
         if message.type in {"motion_command", "distance_cm"}:
@@ -380,17 +779,18 @@ class MotionControlThread(BaseThread):
         self._set_motion_state(False)
 
     def _set_stepper_side(self, side: int):
-        clamped = max(-1, min(1, side))
+        clamped = -1 if side < 0 else 1 if side > 0 else 0
         if clamped == self._stepper_side:
             return
 
         steps_per_side = max(1, int(self.config.stepper_steps_per_90deg))
         delta_steps = (clamped - self._stepper_side) * steps_per_side
 
-        self.stepper.step(delta_steps, delay_s=max(0.0, self.config.stepper_step_delay_s))
+        delay_s = self.config.stepper_step_delay_s
+        self.stepper.step(delta_steps, delay_s=delay_s if delay_s > 0.0 else 0.0)
         self._stepper_side = clamped
 
-    def execute_command_text(self, command_text: str):
+    def execute_command_text(self, command_text: str, now: float | None = None):
         parsed = parse_motion_command(command_text)
         if parsed.action == "unknown":
             logging.warning("Motion thread ignored unknown command: %r", command_text)
@@ -443,6 +843,7 @@ class MotionControlThread(BaseThread):
                 parsed.duration_s
                 if parsed.duration_s is not None
                 else max(0.0, self.config.turn_duration_s),
+                now=now,
             )
             return
 
@@ -455,25 +856,35 @@ class MotionControlThread(BaseThread):
                 parsed.duration_s
                 if parsed.duration_s is not None
                 else max(0.0, self.config.move_duration_s),
+                now=now,
             )
 
-    def _handle_distance_message(self, content: str):
+    def _handle_distance_message(self, message: Message):
         try:
-            payload = json.loads(content)
+            payload = (
+                message.payload
+                if message.payload is not None
+                else json.loads(message.content)
+            )
             value = payload.get("value")
             if isinstance(value, (int, float)):
                 self._latest_distance_cm = float(value)
+                self._distance_dirty = True
         except Exception:
-            logging.debug("Invalid distance message payload: %s", content)
+            logging.debug("Invalid distance message payload: %s", message.content)
 
-    def _handle_motion_message(self, content: str):
+    def _handle_motion_message(self, message: Message, now: float | None = None):
         try:
-            payload = json.loads(content)
+            payload = (
+                message.payload
+                if message.payload is not None
+                else json.loads(message.content)
+            )
             command = str(payload.get("command", "")).strip()
             if command:
-                self.execute_command_text(command)
+                self.execute_command_text(command, now=now)
         except Exception:
-            logging.exception("Failed to decode motion_command payload: %s", content)
+            logging.exception("Failed to decode motion_command payload: %s", message.content)
 
     def _tick_follow(self, now: float):
         if not self._follow_enabled or self._drive_direction is not None:
@@ -502,10 +913,16 @@ class MotionControlThread(BaseThread):
         self._last_follow_action_ts = now
 
     def _tick(self, now: float):
+        drive_ended = False
         if self._drive_direction is not None and now >= self._drive_until:
             self._stop_drive()
+            drive_ended = True
 
-        self._tick_follow(now)
+        # Follow output can only change on a fresh distance reading (or when
+        # a drive pulse just ended), so skip the re-plan on idle iterations.
+        if self._distance_dirty or drive_ended:
+            self._distance_dirty = False
+            self._tick_follow(now)
 
     def _shutdown_hardware(self):
         try:
@@ -526,22 +943,31 @@ class MotionControlThread(BaseThread):
             logging.debug("Motion shutdown: stepper close failed", exc_info=True)
 
     def run(self):
+        # Hoist hot-loop lookups to locals; this loop runs many times per second.
+        get_nowait = self._inbox.get_nowait
+        handle_distance = self._handle_distance_message
+        handle_motion = self._handle_motion_message
+        tick = self._tick
+        monotonic = time.monotonic
+        sleep = time.sleep
+        loop_sleep = max(0.01, self.config.loop_sleep_s)
+
         try:
             while self.running:
-                now = time.monotonic()
+                now = monotonic()
 
                 while True:
                     try:
-                        message = self._inbox.get_nowait()
+                        message = get_nowait()
                     except queue_mod.Empty:
                         break
 
                     if message.type == "distance_cm":
-                        self._handle_distance_message(message.content)
+                        handle_distance(message)
                     elif message.type == "motion_command":
-                        self._handle_motion_message(message.content)
+                        handle_motion(message, now=now)
 
-                self._tick(now)
-                time.sleep(max(0.01, self.config.loop_sleep_s))
+                tick(now)
+                sleep(loop_sleep)
         finally:
             self._shutdown_hardware()
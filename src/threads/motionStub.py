@@ -42,6 +42,7 @@ class MotionStubThread(BaseThread):
 
     def _persist_command(self, payload: dict):
         payload = dict(payload)
+        # Seconds, matching what every real producer puts in this field.
         payload.setdefault("created_at", time.time())
 
         self._latest_path.write_text(
@@ -60,7 +61,11 @@ class MotionStubThread(BaseThread):
                 continue
 
             try:
-                payload = json.loads(message.content)
+                payload = (
+                    message.payload
+                    if message.payload is not None
+                    else json.loads(message.content)
+                )
                 command = str(payload.get("command", "")).strip()
                 if not command:
                     continue
@@ -22,8 +22,10 @@ class UltrasonicFront(BaseThread):
     def run(self):
         while self.running:
             dist_cm = self.sensor.read_cm()
+            payload = {"value": dist_cm}
             self.broadcast_message(
                 "distance_cm",
-                json.dumps({"value": dist_cm}),
+                json.dumps(payload),
+                payload=payload,
             )
             time.sleep(0.1)
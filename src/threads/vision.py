@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import concurrent.futures
 from dataclasses import dataclass, asdict
 import json
 import logging
 import os
 import queue
+import threading
 import time
 from pathlib import Path
 
 import numpy as np
 
 import cv2
-from picamera2 import Picamera2
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
 
 from src.core.message import Message
 from src.threads.baseThread import BaseThread
@@ -22,9 +28,19 @@ from src.vision.face_service import (
     DEFAULT_RECOG_MODEL,
     DEFAULT_DB_PATH,
     DEFAULT_TRUST_MAP_PATH,
+    finalize_embedding,
+    load_face_db,
+    save_face_db,
 )
 
 
+def _dumps_compact(obj) -> str:
+    """Compact JSON encode; uses orjson when installed (C extension)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
 @dataclass
 class VisionThreadConfig:
     width: int = 640
@@ -38,6 +54,9 @@ class VisionThreadConfig:
     detector_score_threshold: float = 0.80
     detector_nms_threshold: float = 0.30
     reload_every_s: float = 2.0
+    # Mean per-pixel absdiff on an 80x60 grayscale thumbnail below which
+    # the scene counts as static and detection is skipped. 0 disables.
+    motion_gate_mean_diff: float = 3.0
     detect_model_path: str = DEFAULT_DETECT_MODEL
     recog_model_path: str = DEFAULT_RECOG_MODEL
     db_path: str = DEFAULT_DB_PATH
@@ -52,30 +71,65 @@ class VisionThread(BaseThread):
     def __init__(self, config: VisionThreadConfig, message_queue: queue.Queue[Message]):
         super().__init__(name="VisionThread", queue=message_queue)
         self.config = config
-        self.picam2: Picamera2 | None = None
+        # Let YuNet/SFace use every Pi core instead of OpenCV's default.
+        cv2.setNumThreads(os.cpu_count() or 1)
+        cv2.setUseOptimized(True)
+        # Camera and engine are built lazily in run() so constructing the
+        # thread does not block the app on model/camera bring-up.
+        self.picam2 = None
         self._control_inbox: queue.Queue[Message] = queue.Queue()
+        # 1-slot frame buffer filled by the capture thread; inference always
+        # consumes the newest frame while the next capture happens in parallel.
+        self._frame_queue: queue.Queue[np.ndarray] = queue.Queue(maxsize=1)
+        self._capture_thread: threading.Thread | None = None
+        # Reusable frame buffers flow between the threads through two
+        # queues: _frame_queue carries the newest filled slot to the
+        # consumer, _free_slots hands consumed slots back. The producer
+        # writes only into slots it owns, so a buffer can never be
+        # overwritten while the consumer is still reading it.
+        self._free_slots: queue.Queue[np.ndarray] = queue.Queue()
+        self._mapped_array_cls = None
         self._hold_until_monotonic: float = 0.0
-        self._last_face_event_payload: dict | None = None
+        # Serialized positive face event up to (and including) ',"ts":'.
+        self._hold_payload_prefix: str | None = None
+        # Previous downscaled grayscale frame for the static-scene gate,
+        # and the last emitted event serialized the same prefix way so a
+        # gated tick only splices in a fresh ts.
+        self._prev_gray_small: np.ndarray | None = None
+        self._last_payload_prefix: str | None = None
+        # Parsed twin of the cached serialization, handed to in-process
+        # subscribers via Message.payload (replayed with a fresh ts).
+        self._last_payload_obj: dict = {}
+        # Single-worker pool for JPEG encode + disk writes so enrollment
+        # captures don't block the recognition loop on SD-card I/O.
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="VisionIO"
+        )
 
         if self.config.default_known_trust not in TRUST_LEVELS:
             raise ValueError(
                 f"Invalid default_known_trust '{self.config.default_known_trust}'. Allowed: {TRUST_LEVELS}"
             )
 
-        self.engine = FaceEngine(
-            detect_model_path=self.config.detect_model_path,
-            recog_model_path=self.config.recog_model_path,
-            db_path=self.config.db_path,
-            trust_map_path=self.config.trust_map_path,
-            match_threshold=self.config.match_threshold,
-            stable_k=self.config.stable_k,
-            stable_window=self.config.stable_window,
-            default_known_trust=self.config.default_known_trust,
-            detector_score_threshold=self.config.detector_score_threshold,
-            detector_nms_threshold=self.config.detector_nms_threshold,
-            reload_every_s=self.config.reload_every_s,
-            camera_size=(self.config.width, self.config.height),
-        )
+        self.engine: FaceEngine | None = None
+
+    def _get_engine(self) -> FaceEngine:
+        if self.engine is None:
+            self.engine = FaceEngine(
+                detect_model_path=self.config.detect_model_path,
+                recog_model_path=self.config.recog_model_path,
+                db_path=self.config.db_path,
+                trust_map_path=self.config.trust_map_path,
+                match_threshold=self.config.match_threshold,
+                stable_k=self.config.stable_k,
+                stable_window=self.config.stable_window,
+                default_known_trust=self.config.default_known_trust,
+                detector_score_threshold=self.config.detector_score_threshold,
+                detector_nms_threshold=self.config.detector_nms_threshold,
+                reload_every_s=self.config.reload_every_s,
+                camera_size=(self.config.width, self.config.height),
+            )
+        return self.engine
 
     @staticmethod
     def _load_json_object(path: str) -> dict:
@@ -97,53 +151,75 @@ class VisionThread(BaseThread):
             json.dump(data, f, ensure_ascii=False, indent=2)
         tmp.replace(p)
 
-    @staticmethod
-    def _l2_normalize(v: np.ndarray) -> np.ndarray:
-        n = float(np.linalg.norm(v))
-        return v / (n + 1e-9)
-
     def _register_identity(self, name: str, trust_level: str) -> dict:
         if self.picam2 is None:
             raise RuntimeError("camera is not initialized")
 
-        embeddings: list[np.ndarray] = []
+        engine = self._get_engine()
+        samples_needed = max(1, self.config.enroll_samples)
+        emb_buf: np.ndarray | None = None
+        captured = 0
         last_frame_bgr = None
 
-        for _attempt in range(1, max(1, self.config.enroll_max_attempts) + 1):
-            frame_rgb = self.picam2.capture_array()
-            frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-            last_frame_bgr = frame_bgr
-
-            self.engine.init_models_for_frame(frame_bgr)
-            faces = self.engine.detect_faces(frame_bgr)
-            if faces is None or len(faces) == 0:
-                time.sleep(max(0.0, self.config.enroll_interval_s))
-                continue
-
-            primary = self.engine._pick_primary_face(faces)
-            emb = self.engine._embedding_for_face(frame_bgr, primary)
-            embeddings.append(self._l2_normalize(emb))
-
-            if len(embeddings) >= max(1, self.config.enroll_samples):
-                break
-
-            time.sleep(max(0.0, self.config.enroll_interval_s))
-
-        if len(embeddings) < max(1, self.config.enroll_samples):
+        interval_s = max(0.0, self.config.enroll_interval_s)
+        attempts_left = max(1, self.config.enroll_max_attempts)
+
+        while captured < samples_needed and attempts_left > 0:
+            # Capture a round of frames first, then run one batched
+            # detect+embed call so the models stay hot across samples.
+            batch_n = min(samples_needed - captured, attempts_left)
+            frames: list[np.ndarray] = []
+            for i in range(batch_n):
+                # Copy out of the capture slot and hand it straight back:
+                # the batch must survive the next captures.
+                slot = self._next_frame()
+                frames.append(slot.copy())
+                self._release_frame(slot)
+                if i + 1 < batch_n:
+                    time.sleep(interval_s)
+            attempts_left -= batch_n
+            last_frame_bgr = frames[-1]
+
+            for emb in engine.detect_and_embed_batch(frames):
+                if emb is None:
+                    continue
+                # Collect raw embeddings into a pre-allocated buffer; the
+                # whole batch is normalized in one vectorized pass below.
+                if emb_buf is None:
+                    emb_buf = np.empty((samples_needed, emb.shape[0]), dtype=np.float32)
+                np.copyto(emb_buf[captured], emb)
+                captured += 1
+                if captured >= samples_needed:
+                    break
+
+            if captured < samples_needed and attempts_left > 0:
+                time.sleep(interval_s)
+
+        if captured < samples_needed or emb_buf is None:
             raise RuntimeError(
-                f"captured only {len(embeddings)}/{self.config.enroll_samples} face samples"
+                f"captured only {captured}/{self.config.enroll_samples} face samples"
             )
 
-        avg = np.mean(np.stack(embeddings, axis=0), axis=0).astype(np.float32)
-        avg = self._l2_normalize(avg)
+        avg = finalize_embedding(emb_buf)
 
-        db = self._load_json_object(self.config.db_path)
+        # Rewrite the files only when something actually changed;
+        # SD-card atomic replaces are expensive.
+        db = load_face_db(self.config.db_path)
         trust_map = self._load_json_object(self.config.trust_map_path)
-        db[name] = avg.tolist()
-        trust_map[name] = trust_level
 
-        self._save_json_object(self.config.db_path, db)
-        self._save_json_object(self.config.trust_map_path, trust_map)
+        # The DB stores float16 rows, so compare at storage precision.
+        avg16 = avg.astype(np.float16)
+        prev_emb = db.get(name)
+        db_changed = prev_emb is None or not np.array_equal(
+            np.asarray(prev_emb, dtype=np.float16), avg16
+        )
+        if db_changed:
+            db[name] = avg16
+            save_face_db(self.config.db_path, db)
+
+        if trust_map.get(name) != trust_level:
+            trust_map[name] = trust_level
+            self._save_json_object(self.config.trust_map_path, trust_map)
 
         capture_path = None
         if last_frame_bgr is not None:
@@ -152,17 +228,17 @@ class VisionThread(BaseThread):
                 capture_dir = Path.cwd() / capture_dir
             capture_dir.mkdir(parents=True, exist_ok=True)
             capture_path = capture_dir / f"enroll_{name}_{int(time.time())}.jpg"
-            cv2.imwrite(str(capture_path), last_frame_bgr)
+            # last_frame_bgr is a private copy, safe to encode concurrently.
+            self._io_pool.submit(cv2.imwrite, str(capture_path), last_frame_bgr)
 
-        # Refresh in-memory engine state right away
-        self.engine._load_db()
-        self.engine._load_trust_map()
+        # Refresh in-memory engine state right away without a JSON reparse
+        engine.upsert_identity(name, avg, trust_level)
 
         return {
             "ok": True,
             "name": name,
             "trust_level": trust_level,
-            "samples": len(embeddings),
+            "samples": captured,
             "capture_path": str(capture_path) if capture_path is not None else None,
             "ts": time.time(),
         }
@@ -191,72 +267,191 @@ class VisionThread(BaseThread):
             json.dumps(result, ensure_ascii=False),
         )
 
-    def _drain_control_messages(self):
-        while True:
-            try:
-                msg = self._control_inbox.get_nowait()
-            except queue.Empty:
-                break
-
-            if msg.type == "vision_register_request":
-                self._handle_register_request(msg)
-
     def handle_message(self, message: Message):
         if message.type == "vision_register_request":
             self._control_inbox.put(message)
 
+    def _acquire_slot(self) -> np.ndarray | None:
+        """Take a buffer the producer is allowed to write into.
+
+        Prefers a free slot; failing that, reclaims the stale queued frame
+        the consumer has not picked up yet. Never returns a slot the
+        consumer is still reading.
+        """
+        try:
+            return self._free_slots.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._frame_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _capture_loop(self) -> None:
+        while self.running and self.picam2 is not None:
+            frame = self._acquire_slot()
+            if frame is None:
+                # Consumer momentarily owns every slot; retry shortly.
+                time.sleep(0.005)
+                continue
+            try:
+                # Copy the mmap'd request buffer into the owned slot: one
+                # memcpy, no per-frame ndarray allocation.
+                request = self.picam2.capture_request()
+                try:
+                    with self._mapped_array_cls(request, "main") as mapped:
+                        np.copyto(frame, mapped.array)
+                finally:
+                    request.release()
+            except Exception:
+                self._free_slots.put(frame)
+                if not self.running:
+                    break
+                logging.exception("VisionThread capture failed")
+                time.sleep(0.1)
+                continue
+
+            # Drop the stale frame so the consumer always sees the newest one.
+            try:
+                self._frame_queue.put_nowait(frame)
+            except queue.Full:
+                try:
+                    self._free_slots.put(self._frame_queue.get_nowait())
+                except queue.Empty:
+                    pass
+                try:
+                    self._frame_queue.put_nowait(frame)
+                except queue.Full:
+                    self._free_slots.put(frame)
+
+    def _next_frame(self, timeout_s: float = 2.0) -> np.ndarray:
+        return self._frame_queue.get(timeout=timeout_s)
+
+    def _release_frame(self, frame: np.ndarray) -> None:
+        """Return a consumed slot to the capture thread."""
+        self._free_slots.put(frame)
+
+    def _scene_is_static(self, frame_bgr: np.ndarray) -> bool:
+        """Cheap temporal gate: compare an 80x60 grayscale thumbnail against
+        the previous tick's and report whether the scene barely moved."""
+        if self.config.motion_gate_mean_diff <= 0:
+            return False
+        gray = cv2.cvtColor(
+            cv2.resize(frame_bgr, (80, 60), interpolation=cv2.INTER_AREA),
+            cv2.COLOR_BGR2GRAY,
+        )
+        prev = self._prev_gray_small
+        self._prev_gray_small = gray
+        if prev is None:
+            return False
+        mean_diff = float(cv2.absdiff(gray, prev).mean())
+        return mean_diff < self.config.motion_gate_mean_diff
+
     def _start_camera(self) -> None:
+        from picamera2 import MappedArray, Picamera2  # deferred: slow import, camera-only
+
+        self._mapped_array_cls = MappedArray
         self.picam2 = Picamera2()
         cam_size = (self.config.width, self.config.height)
-        cfg = self.picam2.create_preview_configuration(main={"format": "RGB888", "size": cam_size})
+        # Three slots: one being written, one queued, one being consumed.
+        self._free_slots = queue.Queue()
+        for _ in range(3):
+            self._free_slots.put(
+                np.empty((self.config.height, self.config.width, 3), dtype=np.uint8)
+            )
+        # BGR888 lets the ISP hand us OpenCV byte order directly (no per-frame cvtColor).
+        cfg = self.picam2.create_preview_configuration(main={"format": "BGR888", "size": cam_size})
         self.picam2.configure(cfg)
         self.picam2.start()
         time.sleep(0.4)
 
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, name="VisionCapture", daemon=True
+        )
+        self._capture_thread.start()
+
     def _stop_camera(self) -> None:
         if self.picam2 is not None:
             self.picam2.stop()
             self.picam2 = None
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
 
     def run(self) -> None:
         try:
             self._start_camera()
+            engine = self._get_engine()
             period = 1.0 / max(0.1, self.config.recognition_fps)
             next_tick = time.monotonic()
 
             while self.running:
+                # Wait for the next tick on the control inbox instead of a
+                # blind sleep: a register request wakes the loop immediately.
+                while True:
+                    sleep_for = next_tick - time.monotonic()
+                    if sleep_for <= 0:
+                        break
+                    try:
+                        msg = self._control_inbox.get(timeout=sleep_for)
+                    except queue.Empty:
+                        break
+                    if msg.type == "vision_register_request":
+                        self._handle_register_request(msg)
                 now_m = time.monotonic()
-                sleep_for = next_tick - now_m
-                if sleep_for > 0:
-                    time.sleep(sleep_for)
-                else:
+                if next_tick < now_m:
                     next_tick = now_m
                 next_tick += period
 
                 try:
-                    self._drain_control_messages()
-
-                    frame_rgb = self.picam2.capture_array()
-                    frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-
-                    event = self.engine.step(frame_bgr)
-                    payload_obj = asdict(event)
+                    frame_bgr = self._next_frame()
+                    try:
+                        # Static scene means the same result: skip YuNet/SFace
+                        # entirely and replay the last event with a fresh ts.
+                        if self._scene_is_static(frame_bgr) and self._last_payload_prefix is not None:
+                            ts = time.time()
+                            payload = self._last_payload_prefix + format(ts, ".3f") + "}"
+                            payload_obj = dict(self._last_payload_obj, ts=ts)
+                            self.broadcast_message("vision_identity", payload, payload=payload_obj)
+                            continue
+
+                        event = engine.step(frame_bgr)
+                    finally:
+                        # engine.step keeps no reference to the frame, so the
+                        # slot can go back to the capture thread right away.
+                        self._release_frame(frame_bgr)
 
                     now_m = time.monotonic()
                     if event.face_detected:
+                        payload_obj = asdict(event)
+                        payload = _dumps_compact(payload_obj)
                         self._hold_until_monotonic = now_m + max(0.0, self.config.presence_hold_s)
-                        self._last_face_event_payload = dict(payload_obj)
+                        # Cache the serialized event minus its timestamp so
+                        # held ticks only splice in a fresh ts, skipping
+                        # asdict + json encoding entirely.
+                        hold_obj = dict(payload_obj)
+                        hold_obj.pop("ts", None)
+                        self._hold_payload_prefix = _dumps_compact(hold_obj)[:-1] + ',"ts":'
+                        self._last_payload_prefix = self._hold_payload_prefix
+                        self._last_payload_obj = payload_obj
                     elif (
-                        self._last_face_event_payload is not None
+                        self._hold_payload_prefix is not None
                         and now_m < self._hold_until_monotonic
                     ):
-                        payload_obj = dict(self._last_face_event_payload)
-                        payload_obj["ts"] = time.time()
-                        payload_obj["face_detected"] = True
-
-                    payload = json.dumps(payload_obj, separators=(",", ":"), ensure_ascii=False)
-
-                    self.broadcast_message("vision_identity", payload)
+                        ts = time.time()
+                        payload = self._hold_payload_prefix + format(ts, ".3f") + "}"
+                        payload_obj = dict(self._last_payload_obj, ts=ts)
+                    else:
+                        payload_obj = asdict(event)
+                        payload = _dumps_compact(payload_obj)
+                        self._last_payload_obj = payload_obj
+                        trimmed = dict(payload_obj)
+                        trimmed.pop("ts", None)
+                        self._last_payload_prefix = _dumps_compact(trimmed)[:-1] + ',"ts":'
+
+                    # In-process subscribers read the dict straight off the
+                    # message; only external sinks pay for the JSON string.
+                    self.broadcast_message("vision_identity", payload, payload=payload_obj)
                     logging.debug(
                         "Vision identity: face=%s name=%s trust=%s sim=%.3f",
                         event.face_detected,
@@ -270,10 +465,8 @@ class VisionThread(BaseThread):
                         "ts": time.time(),
                         "error": str(e),
                     }
-                    self.broadcast_message(
-                        "vision_error",
-                        json.dumps(err_event, separators=(",", ":"), ensure_ascii=False),
-                    )
+                    self.broadcast_message("vision_error", _dumps_compact(err_event))
                     logging.exception("VisionThread step failed")
         finally:
             self._stop_camera()
+            self._io_pool.shutdown(wait=True)
@@ -3,20 +3,50 @@ import os
 import json
 import time
 import argparse
-from typing import Dict, Any, Tuple, Optional, List
+from typing import Dict, Any, Tuple, Optional
 
 import cv2
 import numpy as np
 from picamera2 import Picamera2
 
+try:
+    from src.vision.face_service import (
+        finalize_embedding,
+        load_face_db,
+        make_detector,
+        make_recognizer,
+        save_face_db,
+    )
+except ImportError:  # running the script directly from src/vision
+    from face_service import (
+        finalize_embedding,
+        load_face_db,
+        make_detector,
+        make_recognizer,
+        save_face_db,
+    )
+
 
 TRUST_LEVELS = ("UNKNOWN", "Guest", "Friend", "OWNER")
 
 _THIS_DIR = os.path.dirname(os.path.abspath(__file__))
 _PROJECT_ROOT = os.path.abspath(os.path.join(_THIS_DIR, "..", ".."))
 
-DEFAULT_DETECT_MODEL = os.path.join(_THIS_DIR, "models", "face_detection_yunet.onnx")
-DEFAULT_RECOG_MODEL = os.path.join(_THIS_DIR, "models", "face_recognition_sface.onnx")
+
+def _prefer_quantized(model_path: str) -> str:
+    # Use an INT8 artifact (produced by scripts/quantize_face_models.py)
+    # when one sits next to the fp32 model.
+    root, ext = os.path.splitext(model_path)
+    int8_path = f"{root}_int8{ext}"
+    return int8_path if os.path.exists(int8_path) else model_path
+
+
+DEFAULT_DETECT_MODEL = _prefer_quantized(
+    os.path.join(_THIS_DIR, "models", "face_detection_yunet.onnx")
+)
+DEFAULT_RECOG_MODEL = _prefer_quantized(
+    os.path.join(_THIS_DIR, "models", "face_recognition_sface.onnx")
+)
 DEFAULT_DB_PATH = os.path.join(_PROJECT_ROOT, "data", "people", "face_db.json")
 DEFAULT_TRUST_MAP_PATH = os.path.join(_PROJECT_ROOT, "data", "people", "trust_map.json")
 DEFAULT_CAPTURE_DIR = os.path.join(_PROJECT_ROOT, "data", "captures")
@@ -38,11 +68,6 @@ def parse_size(size_str: str) -> Tuple[int, int]:
     return w, h
 
 
-def l2_normalize(v: np.ndarray) -> np.ndarray:
-    n = np.linalg.norm(v)
-    return v / (n + 1e-9)
-
-
 def _load_json_dict(path: str) -> Dict[str, Any]:
     if not os.path.exists(path):
         return {}
@@ -75,7 +100,7 @@ def _detect_largest_face(detector: cv2.FaceDetectorYN, frame_bgr: np.ndarray) ->
     _, faces = detector.detect(frame_bgr)
     if faces is None or len(faces) == 0:
         return None
-    return max(faces, key=lambda f: float(f[2] * f[3]))
+    return faces[int(np.argmax(faces[:, 2] * faces[:, 3]))]
 
 
 def _extract_embedding(
@@ -103,29 +128,33 @@ def enroll(
     trust_map_path: str,
     capture_out: Optional[str],
 ) -> Dict[str, Any]:
+    # Let the face models use every core instead of OpenCV's default.
+    cv2.setNumThreads(os.cpu_count() or 1)
+    cv2.setUseOptimized(True)
+
     picam2 = Picamera2()
-    cfg = picam2.create_preview_configuration(main={"format": "RGB888", "size": camera_size})
+    # BGR888: the ISP delivers OpenCV byte order, no per-frame cvtColor needed.
+    cfg = picam2.create_preview_configuration(main={"format": "BGR888", "size": camera_size})
     picam2.configure(cfg)
     picam2.start()
     time.sleep(0.4)
 
-    embeddings: List[np.ndarray] = []
+    emb_buf: Optional[np.ndarray] = None
+    captured = 0
     last_frame_bgr = None
 
-    detector = cv2.FaceDetectorYN.create(
+    # Cached factories: repeated enroll() calls reuse the parsed models.
+    detector = make_detector(
         detect_model_path,
-        "",
         camera_size,
-        score_threshold=detector_score_threshold,
-        nms_threshold=detector_nms_threshold,
-        top_k=5000,
+        detector_score_threshold,
+        detector_nms_threshold,
     )
-    recognizer = cv2.FaceRecognizerSF.create(recog_model_path, "")
+    recognizer = make_recognizer(recog_model_path)
 
     try:
         for attempt in range(1, max_attempts + 1):
-            frame_rgb = picam2.capture_array()
-            frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+            frame_bgr = picam2.capture_array()
             last_frame_bgr = frame_bgr
 
             face = _detect_largest_face(detector, frame_bgr)
@@ -135,42 +164,53 @@ def enroll(
                 continue
 
             emb = _extract_embedding(recognizer, frame_bgr, face)
-            embeddings.append(l2_normalize(emb))
-            print(f"[{attempt}/{max_attempts}] Captured sample {len(embeddings)}/{samples}")
 
-            if len(embeddings) >= samples:
+            # Collect raw embeddings into a pre-allocated buffer; the whole
+            # batch is normalized in one vectorized pass after capture.
+            if emb_buf is None:
+                emb_buf = np.empty((samples, emb.shape[0]), dtype=np.float32)
+            np.copyto(emb_buf[captured], emb)
+            captured += 1
+            print(f"[{attempt}/{max_attempts}] Captured sample {captured}/{samples}")
+
+            if captured >= samples:
                 break
 
             time.sleep(interval_s)
     finally:
         picam2.stop()
 
-    if len(embeddings) == 0:
+    if captured == 0 or emb_buf is None:
         raise RuntimeError("Enrollment failed: no usable face sample was captured")
 
-    if len(embeddings) < samples:
+    if captured < samples:
         raise RuntimeError(
-            f"Enrollment failed: captured only {len(embeddings)}/{samples} samples within {max_attempts} attempts"
+            f"Enrollment failed: captured only {captured}/{samples} samples within {max_attempts} attempts"
         )
 
-    avg_emb = np.mean(np.stack(embeddings, axis=0), axis=0).astype(np.float32)
-    avg_emb = l2_normalize(avg_emb)
+    avg_emb = finalize_embedding(emb_buf)
 
-    db = _load_json_dict(db_path)
+    db = load_face_db(db_path)
     trust_map = _load_json_dict(trust_map_path)
 
-    db[name] = avg_emb.tolist()
-
     existing_trust = str(trust_map.get(name, "Guest"))
     if existing_trust not in TRUST_LEVELS:
         existing_trust = "Guest"
     final_trust = trust if trust is not None else existing_trust
     if final_trust not in TRUST_LEVELS:
         final_trust = "Guest"
-    trust_map[name] = final_trust
 
-    _save_json_dict(db_path, db)
-    _save_json_dict(trust_map_path, trust_map)
+    # Only rewrite files that actually changed (atomic replace is costly on SD).
+    # The packed DB stores float16 rows, so compare at storage precision.
+    avg16 = avg_emb.astype(np.float16)
+    prev_emb = db.get(name)
+    if prev_emb is None or not np.array_equal(np.asarray(prev_emb, dtype=np.float16), avg16):
+        db[name] = avg16
+        save_face_db(db_path, db)
+
+    if trust_map.get(name) != final_trust:
+        trust_map[name] = final_trust
+        _save_json_dict(trust_map_path, trust_map)
 
     saved_capture_path = None
     if capture_out is not None and last_frame_bgr is not None:
@@ -187,7 +227,7 @@ def enroll(
         "ok": True,
         "name": name,
         "trust_level": final_trust,
-        "samples": len(embeddings),
+        "samples": captured,
         "db_path": db_path,
         "trust_map_path": trust_map_path,
         "capture_path": saved_capture_path,
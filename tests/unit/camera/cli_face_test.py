@@ -40,7 +40,7 @@ def capture_frame():
 def init_models(w, h):
     detector = cv2.FaceDetectorYN.create(
         DETECT_MODEL, "", (w, h),
-        score_threshold=0.9, nms_threshold=0.3, top_k=5000
+        score_threshold=0.9, nms_threshold=0.3, top_k=50
     )
     recognizer = cv2.FaceRecognizerSF.create(RECOG_MODEL, "")
     return detector, recognizer
@@ -28,7 +28,7 @@ def main():
         (w, h),
         score_threshold=0.9,
         nms_threshold=0.3,
-        top_k=5000
+        top_k=50
     )
 
     _, faces = detector.detect(frame_bgr)
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 import argparse
+import functools
+import gc
 import os
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Run tests :
@@ -59,15 +63,56 @@ def ensure_out_dir():
     os.makedirs(OUT_DIR, exist_ok=True)
 
 
-def test_camera():
+@functools.lru_cache(maxsize=None)
+def _which(name):
+    # shutil.which walks and stats every $PATH entry; cache it so repeated
+    # lookups across the tests cost one dict hit instead of SD-card stats.
+    return shutil.which(name)
+
+
+# Persistent still camera: libcamera init costs ~600-800 ms per rpicam-still
+# invocation; picamera2 keeps the ISP pipeline configured between shots.
+_picam2 = None
+
+
+def _get_still_camera():
+    global _picam2
+    if _picam2 is None:
+        from picamera2 import Picamera2
+        cam = Picamera2()
+        cam.configure(cam.create_still_configuration(main={"size": (1280, 720)}))
+        cam.start()
+        _picam2 = cam
+    return _picam2
+
+
+def test_camera(session_ts=None):
     """
-    Uses rpicam-still (recommended on modern Pi OS/Debian).
+    Captures through a persistent picamera2 instance when the library is
+    installed; otherwise shells out to rpicam-still (recommended on modern
+    Pi OS/Debian).
     """
-    ensure_out_dir()
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # main() creates OUT_DIR and stamps the session once; the fallback keeps
+    # the function usable on its own.
+    ts = session_ts or datetime.now().strftime("%Y%m%d_%H%M%S")
     out_path = os.path.join(OUT_DIR, f"camera_{ts}.jpg")
 
-    if shutil.which("rpicam-still") is None:
+    try:
+        cam = _get_still_camera()
+    except Exception as e:
+        print(f"⚠️ picamera2 unavailable ({e}); falling back to rpicam-still.")
+        cam = None
+
+    if cam is not None:
+        try:
+            cam.capture_file(out_path)
+            print(f"✅ Camera OK. Saved: {out_path}")
+            return True
+        except Exception as e:
+            print(f"❌ Camera test failed: {e}")
+            return False
+
+    if _which("rpicam-still") is None:
         print("❌ rpicam-still not found. Install: sudo apt install rpicam-apps")
         return False
 
@@ -87,11 +132,37 @@ def test_camera():
         return False
 
 
-def test_i2c_scan():
+def _open_i2c_bus():
+    """
+    One smbus2 handle shared by the scan and the OLED; each /dev/i2c-1 open
+    pays a udev/permission traversal, so do it once per run.
+    """
+    try:
+        from smbus2 import SMBus
+        return SMBus(I2C_BUS)
+    except Exception as e:
+        print(f"⚠️ smbus2 unavailable ({e}); I2C falls back to i2cdetect/luma-owned opens.")
+        return None
+
+
+def test_i2c_scan(bus=None):
     """
     Quick scan to confirm OLED address appears on I2C bus.
     """
-    if shutil.which("i2cdetect") is None:
+    if bus is not None:
+        found = []
+        for addr in range(0x03, 0x78):
+            try:
+                bus.read_byte(addr)
+                found.append(addr)
+            except OSError:
+                continue
+        print("I2C devices found: " + (", ".join(f"0x{a:02x}" for a in found) or "none"))
+        ok = OLED_I2C_ADDR in found
+        print("✅ OLED address present." if ok else f"❌ OLED 0x{OLED_I2C_ADDR:02x} not found.")
+        return ok
+
+    if _which("i2cdetect") is None:
         print("❌ i2cdetect not found. Install: sudo apt install i2c-tools")
         return False
 
@@ -104,7 +175,7 @@ def test_i2c_scan():
         return False
 
 
-def oled_init():
+def oled_init(bus=None):
     """
     Tries to init an SSD1306 OLED via luma.oled.
     If libs missing, returns None.
@@ -112,7 +183,10 @@ def oled_init():
     try:
         from luma.core.interface.serial import i2c
         from luma.oled.device import ssd1306
-        serial = i2c(port=I2C_BUS, address=OLED_I2C_ADDR)
+        if bus is not None:
+            serial = i2c(bus=bus, address=OLED_I2C_ADDR)  # reuse the scan handle
+        else:
+            serial = i2c(port=I2C_BUS, address=OLED_I2C_ADDR)
         device = ssd1306(serial)
         return device
     except Exception as e:
@@ -121,84 +195,222 @@ def oled_init():
         return None
 
 
+# One cached framebuffer for oled_show: luma's canvas context allocates a
+# fresh PIL Image and pushes the full frame over I2C on every call, which
+# the ultrasonic loop hits ~3x/s for 5 seconds.
+_oled_img = None
+_oled_last_lines = None
+_oled_lock = threading.Lock()  # tests run concurrently but share the OLED
+
+
+@functools.lru_cache(maxsize=256)
+def _render_line(text):
+    # PIL glyph rasterization dominates SSD1306 update cost; static lines
+    # like "SELF TEST" are rendered once and pasted from cache afterwards.
+    from PIL import Image, ImageDraw
+
+    img = Image.new("1", (128, 10))
+    ImageDraw.Draw(img).text((0, 0), text, fill=255)
+    return img
+
+
 def oled_show(device, lines):
+    global _oled_img, _oled_last_lines
     try:
-        from luma.core.render import canvas
-        with canvas(device) as draw:
+        from PIL import Image
+
+        with _oled_lock:
+            shown = tuple(lines[:6])
+            if shown == _oled_last_lines:
+                return  # identical frame; skip the I2C transfer entirely
+
+            if _oled_img is None:
+                _oled_img = Image.new("1", (device.width, device.height))
+
+            _oled_img.paste(0, (0, 0, device.width, device.height))
             y = 0
-            for line in lines[:6]:
-                draw.text((0, y), line, fill=255)
+            for line in shown:
+                _oled_img.paste(_render_line(line), (0, y))
                 y += 10
+
+            device.display(_oled_img)
+            _oled_last_lines = shown
     except Exception as e:
         print(f"⚠️ OLED draw failed: {e}")
 
 
 def test_buzzer():
+    """
+    Each edge is a raw lgpio line write when the binding is installed
+    (one ioctl, no gpiozero pin-factory indirection per toggle); falls
+    back to gpiozero.Buzzer otherwise.
+    """
+    chip = None
     try:
-        from gpiozero import Buzzer
-        buz = Buzzer(BUZZER_GPIO)
+        try:
+            from lgpio import gpiochip_open, gpiochip_close, gpio_claim_output, gpio_write
+
+            chip = gpiochip_open(0)
+            gpio_claim_output(chip, BUZZER_GPIO, 0)
+
+            def buz_on():
+                gpio_write(chip, BUZZER_GPIO, 1)
+
+            def buz_off():
+                gpio_write(chip, BUZZER_GPIO, 0)
+        except Exception:
+            if chip is not None:
+                try:
+                    gpiochip_close(chip)
+                except Exception:
+                    pass
+            chip = None
+
+        if chip is None:
+            from gpiozero import Buzzer
+            buz = Buzzer(BUZZER_GPIO)
+            buz_on = buz.on
+            buz_off = buz.off
 
         print("Beeping buzzer...")
         for _ in range(3):
-            buz.on()
+            buz_on()
             time.sleep(0.15)
-            buz.off()
+            buz_off()
             time.sleep(0.15)
 
-        buz.on()
+        buz_on()
         time.sleep(0.4)
-        buz.off()
+        buz_off()
 
         print("✅ Buzzer OK (you should have heard beeps).")
         return True
     except Exception as e:
         print(f"❌ Buzzer test failed: {e}")
         return False
+    finally:
+        if chip is not None:
+            gpiochip_close(chip)
 
 
 def test_ultrasonic(oled_device=None):
     """
     Timeout-safe ultrasonic test.
-    Works even if sensor is NOT wired: it will fail fast and return.
+    Echo edges are timestamped by the pigpio daemon when it is available
+    (microsecond hardware ticks, no Python busy-wait); otherwise falls back
+    to polling gpiozero. Works even if sensor is NOT wired: it will fail
+    fast and return.
     """
+    # Real-time scheduling + pinning to one core keeps the echo handling
+    # from being preempted mid-pulse. Both need root; skipped otherwise.
+    prev_sched = None
     try:
-        from gpiozero import DigitalOutputDevice, DigitalInputDevice
-
-        trig = DigitalOutputDevice(US_TRIG_GPIO, initial_value=False)
-        echo = DigitalInputDevice(US_ECHO_GPIO, pull_up=False)
-
-        def ping_once(timeout_s=0.03):
-            # Send 10us trigger pulse
-            trig.off()
-            time.sleep(0.0002)
-            trig.on()
-            time.sleep(0.00001)
-            trig.off()
-
-            # Wait for echo to go high
-            t0 = time.monotonic()
-            while echo.value == 0:
-                if time.monotonic() - t0 > timeout_s:
-                    return None
+        prev_sched = (os.sched_getscheduler(0), os.sched_getparam(0))
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+    except (OSError, PermissionError):
+        prev_sched = None
 
-            pulse_start = time.monotonic()
+    prev_affinity = None
+    try:
+        prev_affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {3})
+    except (OSError, PermissionError, ValueError):
+        prev_affinity = None
+
+    pi = None
+    edge_cb = None
+    try:
+        import pigpio
+        pi = pigpio.pi()
+        if not pi.connected:
+            pi.stop()
+            pi = None
+    except Exception:
+        pi = None
 
-            # Wait for echo to go low
-            while echo.value == 1:
-                if time.monotonic() - pulse_start > timeout_s:
+    try:
+        if pi is not None:
+            pi.set_mode(US_TRIG_GPIO, pigpio.OUTPUT)
+            pi.set_mode(US_ECHO_GPIO, pigpio.INPUT)
+            pi.write(US_TRIG_GPIO, 0)
+
+            echo_done = threading.Event()
+            echo_ticks = [0, 0]  # [rise_tick, fall_tick]
+
+            def _on_echo_edge(gpio, level, tick):
+                if level == 1:
+                    echo_ticks[0] = tick
+                elif level == 0 and echo_ticks[0]:
+                    echo_ticks[1] = tick
+                    echo_done.set()
+
+            edge_cb = pi.callback(US_ECHO_GPIO, pigpio.EITHER_EDGE, _on_echo_edge)
+
+            def ping_once(timeout_s=0.03):
+                echo_ticks[0] = echo_ticks[1] = 0
+                echo_done.clear()
+                pi.gpio_trigger(US_TRIG_GPIO, 10, 1)  # 10us trigger pulse
+
+                if not echo_done.wait(timeout_s):
                     return None
 
-            pulse_end = time.monotonic()
+                # pigpio ticks are 32-bit microseconds and wrap ~72 min;
+                # the masked difference stays correct across the wrap.
+                duration_us = (echo_ticks[1] - echo_ticks[0]) & 0xFFFFFFFF
+                # 34300 cm/s round trip -> us * 0.01715
+                return duration_us * 0.01715
+        else:
+            from gpiozero import DigitalOutputDevice, DigitalInputDevice
+
+            trig = DigitalOutputDevice(US_TRIG_GPIO, initial_value=False)
+            echo = DigitalInputDevice(US_ECHO_GPIO, pull_up=False)
+
+            def ping_once(timeout_s=0.03):
+                # Send 10us trigger pulse
+                trig.off()
+                time.sleep(0.0002)
+                trig.on()
+                time.sleep(0.00001)
+                trig.off()
 
-            # Distance: speed of sound ~34300 cm/s, round trip -> /2
-            duration = pulse_end - pulse_start
-            distance_cm = (duration * 34300.0) / 2.0
-            return distance_cm
+                timeout_ns = int(timeout_s * 1e9)
+
+                # Wait for echo to go high
+                t0 = time.perf_counter_ns()
+                while echo.value == 0:
+                    if time.perf_counter_ns() - t0 > timeout_ns:
+                        return None
+
+                pulse_start = time.perf_counter_ns()
+
+                # Wait for echo to go low
+                while echo.value == 1:
+                    if time.perf_counter_ns() - pulse_start > timeout_ns:
+                        return None
+
+                pulse_end = time.perf_counter_ns()
+
+                # Distance: speed of sound ~34300 cm/s, round trip -> /2
+                duration_us = (pulse_end - pulse_start) / 1000.0
+                return duration_us * 0.01715
+
+        import numpy as np
 
         print("Reading ultrasonic distance for 5 seconds (timeout-safe)...")
+        # No GC pauses while sampling; re-enabled in the finally below.
+        gc.disable()
         t_end = time.time() + 5.0
+        # Pace against absolute monotonic deadlines rather than relative
+        # 0.3 s sleeps, so per-iteration work and sleep wakeup latency do
+        # not accumulate into period drift over the 5 s window.
+        next_tick = time.monotonic() + 0.3
         consecutive_none = 0
 
+        # Median over the last 7 pings knocks out single-ping outliers;
+        # NaN slots are simply ignored until the window fills.
+        median_buf = np.full(7, np.nan, dtype=np.float32)
+        sample_idx = 0
+
         while time.time() < t_end:
             cm = ping_once(timeout_s=0.03)
 
@@ -223,7 +435,9 @@ def test_ultrasonic(oled_device=None):
 
             else:
                 consecutive_none = 0
-                msg = f"Distance: {cm:6.1f} cm"
+                median_buf[sample_idx % 7] = cm
+                sample_idx += 1
+                msg = f"Distance: {float(np.nanmedian(median_buf)):6.1f} cm"
                 print(msg)
 
                 if oled_device:
@@ -235,7 +449,10 @@ def test_ultrasonic(oled_device=None):
                         f"TRIG={US_TRIG_GPIO} ECHO={US_ECHO_GPIO}",
                     ])
 
-            time.sleep(0.3)
+            remaining = next_tick - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            next_tick += 0.3
 
         print("✅ Ultrasonic OK (values printed).")
         return True
@@ -243,28 +460,123 @@ def test_ultrasonic(oled_device=None):
     except Exception as e:
         print(f"❌ Ultrasonic test failed: {e}")
         return False
-
-
-
-def test_audio():
+    finally:
+        gc.enable()
+        if edge_cb is not None:
+            edge_cb.cancel()
+        if pi is not None:
+            pi.stop()
+        if prev_affinity is not None:
+            try:
+                os.sched_setaffinity(0, prev_affinity)
+            except OSError:
+                pass
+        if prev_sched is not None:
+            try:
+                os.sched_setscheduler(0, prev_sched[0], prev_sched[1])
+            except OSError:
+                pass
+
+
+
+def test_audio(session_ts=None):
     """
-    Records 3 seconds and plays it back using ALSA tools (arecord/aplay).
+    Records 3 seconds and plays it back. Talks to ALSA directly through a
+    persistent pyalsaaudio PCM when the binding is installed (one device
+    open per direction, no subprocess per leg); otherwise falls back to
+    the arecord/aplay command-line tools.
     """
-    ensure_out_dir()
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ts = session_ts or datetime.now().strftime("%Y%m%d_%H%M%S")
     wav_path = os.path.join(OUT_DIR, f"mic_{ts}.wav")
 
-    if shutil.which("arecord") is None or shutil.which("aplay") is None:
+    try:
+        import alsaaudio
+    except ImportError:
+        alsaaudio = None
+
+    if alsaaudio is not None:
+        import wave
+
+        rate = 44100
+        period = 1024
+
+        try:
+            print("Recording 3 seconds from microphone (pyalsaaudio)...")
+            rec_kwargs = {"device": ALSA_RECORD_DEV} if ALSA_RECORD_DEV else {}
+            captured = bytearray()
+            rec = alsaaudio.PCM(alsaaudio.PCM_CAPTURE, **rec_kwargs)
+            try:
+                rec.setchannels(1)
+                rec.setrate(rate)
+                rec.setformat(alsaaudio.PCM_FORMAT_S16_LE)
+                rec.setperiodsize(period)
+                for _ in range((rate * 3) // period + 1):
+                    length, data = rec.read()
+                    if length > 0:
+                        captured.extend(data)
+            finally:
+                rec.close()
+
+            with wave.open(wav_path, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(rate)
+                wf.writeframes(bytes(captured))
+            print(f"Recorded: {wav_path}")
+
+            print("Playing it back now (you should hear your recording)...")
+            play_kwargs = {"device": ALSA_PLAY_DEV} if ALSA_PLAY_DEV else {}
+            out = alsaaudio.PCM(alsaaudio.PCM_PLAYBACK, **play_kwargs)
+            try:
+                out.setchannels(1)
+                out.setrate(rate)
+                out.setformat(alsaaudio.PCM_FORMAT_S16_LE)
+                out.setperiodsize(period)
+                chunk = period * 2  # S16_LE mono -> 2 bytes per frame
+                for off in range(0, len(captured), chunk):
+                    out.write(bytes(captured[off:off + chunk]))
+            finally:
+                out.close()
+
+            print("✅ Audio OK (record + playback completed).")
+            return True
+        except Exception as e:
+            print(f"❌ Audio test failed: {e}")
+            print("Tip: run `arecord -l` and `aplay -l` then set ALSA_RECORD_DEV / ALSA_PLAY_DEV in the script.")
+            return False
+
+    if _which("arecord") is None or _which("aplay") is None:
         print("❌ arecord/aplay not found. Install: sudo apt install alsa-utils")
         return False
 
-    rec_cmd = ["arecord", "-f", "cd", "-d", "3", wav_path]
-    play_cmd = ["aplay", wav_path]
+    # 16 kHz mono (what the STT pipeline consumes) with a 1 s ALSA buffer
+    # and 62.5 ms periods — the alsa-utils defaults buffer far more, which
+    # adds startup latency and masks xruns the runtime would actually hit.
+    # -M mmaps the PCM ring so the page-cached WAV is DMA'd without an
+    # extra userspace copy on each period.
+    rec_cmd = [
+        "arecord",
+        "-M",
+        "-f", "S16_LE",
+        "-r", "16000",
+        "-c", "1",
+        "--buffer-size=16000",
+        "--period-size=1000",
+        "-d", "3",
+        wav_path,
+    ]
+    play_cmd = [
+        "aplay",
+        "-M",
+        "--buffer-size=16000",
+        "--period-size=1000",
+        wav_path,
+    ]
 
     if ALSA_RECORD_DEV:
         rec_cmd = ["arecord", "-D", ALSA_RECORD_DEV] + rec_cmd[1:]
     if ALSA_PLAY_DEV:
-        play_cmd = ["aplay", "-D", ALSA_PLAY_DEV, wav_path]
+        play_cmd = ["aplay", "-D", ALSA_PLAY_DEV] + play_cmd[1:]
 
     try:
         print("Recording 3 seconds from microphone...")
@@ -286,12 +598,36 @@ def test_motors_dry_run():
     """
     Toggles GPIO pins as if an L298N is connected.
     This won't confirm motor movement, but confirms GPIO + logic path.
+    ENA/ENB sit on hardware-PWM-capable pins (12/13), so when the pigpio
+    daemon is running they are driven by the PWM peripheral (glitch-free,
+    zero CPU) instead of gpiozero's software PWM thread.
     """
+    pi = None
+    try:
+        import pigpio
+        pi = pigpio.pi()
+        if not pi.connected:
+            pi.stop()
+            pi = None
+    except Exception:
+        pi = None
+
     try:
         from gpiozero import DigitalOutputDevice, PWMOutputDevice
 
-        ena = PWMOutputDevice(MOTOR_ENA, frequency=1000)
-        enb = PWMOutputDevice(MOTOR_ENB, frequency=1000)
+        if pi is not None:
+            def set_enable(duty):
+                # duty is 0.0..1.0; hardware_PWM wants ppm of the period.
+                pi.hardware_PWM(MOTOR_ENA, 1000, int(duty * 1_000_000))
+                pi.hardware_PWM(MOTOR_ENB, 1000, int(duty * 1_000_000))
+        else:
+            ena = PWMOutputDevice(MOTOR_ENA, frequency=1000)
+            enb = PWMOutputDevice(MOTOR_ENB, frequency=1000)
+
+            def set_enable(duty):
+                ena.value = duty
+                enb.value = duty
+
         in1 = DigitalOutputDevice(MOTOR_IN1)
         in2 = DigitalOutputDevice(MOTOR_IN2)
         in3 = DigitalOutputDevice(MOTOR_IN3)
@@ -300,8 +636,7 @@ def test_motors_dry_run():
         print("Motor DRY-RUN: forward 1s, backward 1s, stop.")
 
         # forward
-        ena.value = 0.6
-        enb.value = 0.6
+        set_enable(0.6)
         in1.on(); in2.off()
         in3.on(); in4.off()
         time.sleep(1.0)
@@ -312,8 +647,7 @@ def test_motors_dry_run():
         time.sleep(1.0)
 
         # stop
-        ena.value = 0.0
-        enb.value = 0.0
+        set_enable(0.0)
         in1.off(); in2.off(); in3.off(); in4.off()
 
         print("✅ Motor GPIO dry-run OK (no errors).")
@@ -321,6 +655,11 @@ def test_motors_dry_run():
     except Exception as e:
         print(f"❌ Motor dry-run failed: {e}")
         return False
+    finally:
+        if pi is not None:
+            pi.hardware_PWM(MOTOR_ENA, 0, 0)
+            pi.hardware_PWM(MOTOR_ENB, 0, 0)
+            pi.stop()
 
 
 def main():
@@ -336,34 +675,52 @@ def main():
     print("=== BOT HARDWARE SELF TEST ===")
     print(f"Output dir: {OUT_DIR}")
     ensure_out_dir()
+    session_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Warm the which-cache once and report missing CLI tools up front.
+    missing_tools = [
+        tool
+        for tool in ("rpicam-still", "i2cdetect", "arecord", "aplay")
+        if _which(tool) is None
+    ]
+    if missing_tools:
+        print(f"⚠️ Missing CLI tools: {', '.join(missing_tools)}")
 
     results = {}
 
     # OLED init early so other tests can use it
     oled_device = None
+    i2c_bus = None
     if not args.skip_oled:
-        test_i2c_scan()
-        oled_device = oled_init()
+        i2c_bus = _open_i2c_bus()
+        results["i2c"] = test_i2c_scan(i2c_bus)
+        oled_device = oled_init(i2c_bus)
         if oled_device:
             oled_show(oled_device, ["SELF TEST", "OLED OK", "", "Starting tests..."])
             results["oled"] = True
         else:
             results["oled"] = False
 
+    # The tests are I/O- or sleep-bound and touch disjoint hardware (OLED
+    # access is serialized inside oled_show), so run them concurrently and
+    # pay roughly the slowest test instead of the sum.
+    to_run = []
     if not args.skip_camera:
-        results["camera"] = test_camera()
-
+        to_run.append(("camera", lambda: test_camera(session_ts)))
     if not args.skip_buzzer:
-        results["buzzer"] = test_buzzer()
-
+        to_run.append(("buzzer", test_buzzer))
     if not args.skip_ultrasonic:
-        results["ultrasonic"] = test_ultrasonic(oled_device=oled_device)
-
+        to_run.append(("ultrasonic", lambda: test_ultrasonic(oled_device=oled_device)))
     if not args.skip_audio:
-        results["audio"] = test_audio()
-
+        to_run.append(("audio", lambda: test_audio(session_ts)))
     if not args.skip_motors:
-        results["motors_dry_run"] = test_motors_dry_run()
+        to_run.append(("motors_dry_run", test_motors_dry_run))
+
+    if to_run:
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            futures = {name: ex.submit(fn) for name, fn in to_run}
+            for name, fut in futures.items():
+                results[name] = fut.result()
 
     print("\n=== SUMMARY ===")
     for k, v in results.items():
@@ -378,6 +735,12 @@ def main():
             f"Buz: {'OK' if results.get('buzzer') else 'NO'}",
         ])
 
+    if i2c_bus is not None:
+        try:
+            i2c_bus.close()
+        except Exception:
+            pass
+
     # Exit code = 0 if all non-skipped tests passed
     failed = [k for k, v in results.items() if not v]
     sys.exit(0 if not failed else 1)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import json
 import queue
+import time
 
+from src.core.message import Message
 from src.threads.motion import (
     MotionControlConfig,
     MotionControlThread,
@@ -10,35 +13,43 @@ from src.threads.motion import (
 
 
 class FakeWheels:
+    # Slots + a pre-bound append keep the fake cheap: follow-mode tests tick
+    # these methods in tight loops.
+    __slots__ = ("actions", "_append")
+
     def __init__(self):
         self.actions: list[str] = []
+        self._append = self.actions.append
 
     def stop(self):
-        self.actions.append("stop")
+        self._append("stop")
 
     def forward(self):
-        self.actions.append("forward")
+        self._append("forward")
 
     def backward(self):
-        self.actions.append("backward")
+        self._append("backward")
 
     def spin_left(self):
-        self.actions.append("spin_left")
+        self._append("spin_left")
 
     def spin_right(self):
-        self.actions.append("spin_right")
+        self._append("spin_right")
 
     def close(self):
-        self.actions.append("close")
+        self._append("close")
 
 
 class FakeStepper:
+    __slots__ = ("steps", "_append")
+
     def __init__(self):
         self.steps: list[int] = []
+        self._append = self.steps.append
 
     def step(self, steps: int, delay_s: float):
         _ = delay_s
-        self.steps.append(steps)
+        self._append(steps)
 
     def release(self):
         return
@@ -76,6 +87,18 @@ def test_parse_motion_command_basic():
     assert parse_motion_command("stop now").action == "stop"
 
 
+def test_parse_motion_command_inflected_keywords():
+    # Free-form speech/LLM phrasings; the token table must cover the
+    # inflections the old substring scan matched implicitly.
+    assert parse_motion_command("keep following me").action == "follow"
+    assert parse_motion_command("we stopped").action == "stop"
+    assert parse_motion_command("halted").action == "stop"
+    assert parse_motion_command("reversing now").action == "backward"
+    assert parse_motion_command("turning left").action == "left"
+    assert parse_motion_command("steering left").action == "stepper_left"
+    assert parse_motion_command("stepper centered").action == "stepper_center"
+
+
 def test_stepper_turn_range_is_clamped_to_90_each_side():
     thread, wheels, stepper = _make_thread()
 
@@ -91,26 +114,37 @@ def test_stepper_turn_range_is_clamped_to_90_each_side():
     assert "spin_right" in wheels.actions
 
 
+def _send_distance(thread: MotionControlThread, value_cm: float):
+    thread._handle_distance_message(
+        Message(
+            sender="test",
+            type="distance_cm",
+            content=json.dumps({"value": value_cm}),
+            sent_at=time.time(),
+        )
+    )
+
+
 def test_follow_mode_moves_back_and_forth_around_initial_distance():
     thread, wheels, _ = _make_thread()
 
     # Initial distance at follow command time becomes target.
-    thread._latest_distance_cm = 100.0
+    _send_distance(thread, 100.0)
     thread.execute_command_text("follow")
 
     # Too far -> move forward pulse.
-    thread._latest_distance_cm = 120.0
+    _send_distance(thread, 120.0)
     now = 10.0
     thread._tick(now)
     assert wheels.actions[-1] == "forward"
 
     # After pulse duration and near target -> stop.
-    thread._latest_distance_cm = 101.0
+    _send_distance(thread, 101.0)
     thread._tick(now + 1.0)
     assert wheels.actions[-1] == "stop"
 
     # Too close -> move backward pulse.
-    thread._latest_distance_cm = 80.0
+    _send_distance(thread, 80.0)
     thread._tick(now + 2.0)
     assert wheels.actions[-1] == "backward"
 
@@ -1,21 +1,80 @@
 #!/usr/bin/env python3
+import asyncio
+import io
 import json
+import os
+import socket
 import subprocess
+import threading
+import time
+import wave
 from pathlib import Path
 
-WHISPER_CLI   = Path.home() / "whisper.cpp/build/bin/whisper-cli"
-WHISPER_MODEL = Path.home() / "whisper.cpp/models/ggml-small.en.bin"
+import requests
 
-PIPER_MODEL  = Path.home() / "botfriend/models/tts/en_US-lessac-medium.onnx"
+def _first_existing(*candidates: Path) -> Path:
+    """Return the first candidate that exists, else the last one."""
+    for p in candidates[:-1]:
+        if p.exists():
+            return p
+    return candidates[-1]
+
+
+WHISPER_CLI    = Path.home() / "whisper.cpp/build/bin/whisper-cli"
+WHISPER_SERVER = Path.home() / "whisper.cpp/build/bin/whisper-server"
+# Decode on the Pi CPU is memory-bandwidth-bound, so quantized weights cut
+# decode time roughly in proportion to the byte savings. Prefer the
+# quantized variants when setup has produced them (quantize tool for
+# whisper, onnxruntime quantize_dynamic for the Piper voice).
+WHISPER_MODEL  = _first_existing(
+    Path.home() / "whisper.cpp/models/ggml-small.en-q5_1.bin",
+    Path.home() / "whisper.cpp/models/ggml-small.en.bin",
+)
+WHISPER_PORT   = 8178
+WHISPER_URL    = f"http://127.0.0.1:{WHISPER_PORT}/inference"
+
+PIPER_MODEL  = _first_existing(
+    Path.home() / "botfriend/models/tts/en_US-lessac-medium.int8.onnx",
+    Path.home() / "botfriend/models/tts/en_US-lessac-medium.onnx",
+)
 PIPER_CONFIG = Path.home() / "botfriend/models/tts/en_US-lessac-medium.onnx.json"
 
 LLM_URL = "http://127.0.0.1:8080/v1/chat/completions"
 
-IN_WAV  = Path("/tmp/in.wav")
-OUT_WAV = Path("/tmp/out.wav")
+# Keep-alive session: no curl fork and no fresh TCP handshake per request
+# (same pattern as src/agent/llm_client.py).
+SESSION = requests.Session()
+
+IN_WAV = Path("/tmp/in.wav")
+PIPER_RATE = 22050  # lessac-medium output rate
+
+# Core placement on the 4-core Pi: whisper on 0-1, TTS on 3, leaving 2-3
+# mostly to the llama server (pin that via systemd CPUAffinity=2 3). When
+# the streaming pipeline overlaps the stages, this keeps them from
+# evicting each other's working sets.
+WHISPER_CPUS = {0, 1}
+TTS_CPUS = {3}
+
+
+def _pin(cpus: set[int], nice_delta: int = -5):
+    """preexec_fn that pins the child to `cpus` and bumps its priority.
 
-def sh(cmd: list[str]) -> str:
-    return subprocess.check_output(cmd, text=True, stderr=subprocess.STDOUT)
+    Both calls degrade silently: affinity needs the cores to exist and a
+    negative nice needs privileges; neither is worth failing the stage
+    over.
+    """
+
+    def preexec():
+        try:
+            os.sched_setaffinity(0, cpus)
+        except Exception:
+            pass
+        try:
+            os.nice(nice_delta)
+        except Exception:
+            pass
+
+    return preexec
 
 def check_files():
     missing = []
@@ -25,66 +84,385 @@ def check_files():
     if missing:
         raise SystemExit("Missing required file(s):\n" + "\n".join(missing))
 
+# Long-lived whisper server: whisper-cli reloads the GGML model from disk on
+# every invocation (seconds of startup for a short clip); the server pays the
+# model load once and each turn is inference-only.
+_whisper_proc = None
+
+
+def _port_open(port: int) -> bool:
+    with socket.socket() as s:
+        s.settimeout(0.25)
+        return s.connect_ex(("127.0.0.1", port)) == 0
+
+
+def start_whisper_server(timeout_s=30.0) -> bool:
+    global _whisper_proc
+    if not WHISPER_SERVER.exists():
+        print("[STT] whisper-server not built; falling back to whisper-cli per call")
+        return False
+
+    # -t matches the two-core allotment; more threads would just contend.
+    cmd = [str(WHISPER_SERVER), "-m", str(WHISPER_MODEL), "--port", str(WHISPER_PORT),
+           "-t", str(len(WHISPER_CPUS))]
+    print("[STT] starting", " ".join(cmd))
+    _whisper_proc = subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        preexec_fn=_pin(WHISPER_CPUS),
+    )
+
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if _whisper_proc.poll() is not None:
+            _whisper_proc = None
+            print("[STT] whisper-server exited during startup; using whisper-cli")
+            return False
+        if _port_open(WHISPER_PORT):
+            return True
+        time.sleep(0.2)
+
+    stop_whisper_server()
+    print("[STT] whisper-server never became ready; using whisper-cli")
+    return False
+
+
+def stop_whisper_server():
+    global _whisper_proc
+    if _whisper_proc is not None:
+        _whisper_proc.terminate()
+        try:
+            _whisper_proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            _whisper_proc.kill()
+        _whisper_proc = None
+
+
+# First inference after model load runs seconds slower than steady state
+# (mmapped weights still need faulting in, KV/cache buffers are cold). Warm
+# all three models in the background while the user is speaking.
+def _silence_wav(seconds: float = 1.0) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(b"\x00" * int(16000 * 2 * seconds))
+    return buf.getvalue()
+
+
+def _warmup():
+    try:
+        payload = {
+            "model": "local",
+            "messages": [{"role": "user", "content": "hi"}],
+            "max_tokens": 1,
+        }
+        SESSION.post(LLM_URL, json=payload, timeout=30)
+    except Exception:
+        pass
+
+    try:
+        silence = _silence_wav()
+        if _whisper_proc is not None:
+            SESSION.post(
+                WHISPER_URL,
+                files={"file": ("warmup.wav", silence)},
+                data={"response_format": "json"},
+                timeout=60,
+            )
+        else:
+            subprocess.run(
+                [str(WHISPER_CLI), "-m", str(WHISPER_MODEL), "-f", "-", "-nt", "-np"],
+                input=silence,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+    except Exception:
+        pass
+
+    try:
+        subprocess.run(
+            ["piper", "-m", str(PIPER_MODEL), "-c", str(PIPER_CONFIG), "--output-raw"],
+            input=b"ready\n",
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+        )
+    except Exception:
+        pass
+
+
+def start_warmup() -> threading.Thread:
+    t = threading.Thread(target=_warmup, name="warmup", daemon=True)
+    t.start()
+    return t
+
+
 def record(seconds=5):
+    # Prefer the project's streaming VAD capture: it stops at end of
+    # utterance instead of always blocking the full window.
+    try:
+        from src.audio.vad import VADConfig, record_utterance
+    except ImportError:
+        record_utterance = None
+
+    if record_utterance is not None:
+        print(f"[REC] VAD capture (max {seconds}s, stops on silence)")
+        cfg = VADConfig(min_open_s=1.0, max_record_s=float(seconds))
+        if not record_utterance(IN_WAV, cfg):
+            print("[REC] warning: no speech detected")
+        return
+
     # If your mic needs a specific ALSA device, add: ["-D","plughw:X,Y"]
     cmd = ["arecord", "-f", "S16_LE", "-c1", "-r", "16000", "-t", "wav", "-d", str(seconds), str(IN_WAV)]
     print("[REC]", " ".join(cmd))
     subprocess.check_call(cmd)
 
 def stt() -> str:
-    cmd = [str(WHISPER_CLI), "-m", str(WHISPER_MODEL), "-f", str(IN_WAV), "-nt", "-np"]
-    print("[STT]", " ".join(cmd))
-    out = sh(cmd).strip()
+    # Read the capture once and hand whisper the bytes; neither leg makes
+    # whisper re-open the file.
+    wav_bytes = IN_WAV.read_bytes()
+
+    if _whisper_proc is not None:
+        print("[STT] POST", WHISPER_URL)
+        resp = SESSION.post(
+            WHISPER_URL,
+            files={"file": ("in.wav", wav_bytes)},
+            data={"response_format": "json"},
+            timeout=120,
+        )
+        return " ".join(resp.json().get("text", "").split())
+
+    cmd = [str(WHISPER_CLI), "-m", str(WHISPER_MODEL), "-f", "-", "-nt", "-np",
+           "-t", str(len(WHISPER_CPUS))]
+    print("[STT]", " ".join(cmd), f"({len(wav_bytes)} bytes on stdin)")
+    out = subprocess.run(
+        cmd, input=wav_bytes, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True,
+        preexec_fn=_pin(WHISPER_CPUS),
+    ).stdout.decode("utf-8", "replace")
     # whisper-cli often outputs a leading newline; normalize
     return " ".join(out.split())
 
+# The request body is static apart from the user turn; serialize it once
+# and splice the JSON-escaped user text in, instead of rebuilding the dict
+# and re-dumping the fixed fields every turn.
+_SYSTEM_PROMPT = "You are a helpful robot assistant. Answer in 1 short sentence."
+_LLM_TEMPLATE = json.dumps({
+    "model": "local",
+    "messages": [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": "__USER__"},
+    ],
+    "temperature": 0.2,
+})
+_LLM_STREAM_TEMPLATE = _LLM_TEMPLATE[:-1] + ', "stream": true}'
+
+
+def _llm_body(template: str, user_text: str) -> str:
+    return template.replace('"__USER__"', json.dumps(user_text))
+
+
 def llm(user_text: str) -> str:
-    payload = {
-        "model": "local",
-        "messages": [
-            {"role": "system", "content": "You are a helpful robot assistant. Answer in 1 short sentence."},
-            {"role": "user", "content": user_text},
-        ],
-        "temperature": 0.2,
-    }
     print("[LLM] POST", LLM_URL)
-    raw = sh(["curl", "-s", LLM_URL, "-H", "Content-Type: application/json", "-d", json.dumps(payload)])
-    data = json.loads(raw)
+    resp = SESSION.post(
+        LLM_URL,
+        data=_llm_body(_LLM_TEMPLATE, user_text),
+        headers={"Content-Type": "application/json"},
+        timeout=60,
+    )
+    data = resp.json()
     if "choices" not in data:
-        raise SystemExit("LLM returned unexpected JSON:\n" + raw[:800])
+        raise SystemExit("LLM returned unexpected JSON:\n" + resp.text[:800])
     return data["choices"][0]["message"]["content"].strip()
 
-def tts(text: str):
-    # Make sure output file is fresh
-    if OUT_WAV.exists():
-        OUT_WAV.unlink()
-    cmd = [
-        "piper",
-        "-m", str(PIPER_MODEL),
-        "-c", str(PIPER_CONFIG),
-        "-f", str(OUT_WAV),
-    ]
-    print("[TTS] generating", OUT_WAV)
-    p = subprocess.run(cmd, input=(text + "\n"), text=True)
-    if p.returncode != 0:
-        raise SystemExit("Piper failed.")
-    if not OUT_WAV.exists() or OUT_WAV.stat().st_size < 1000:
-        raise SystemExit("TTS output WAV not created or too small.")
-
-def play():
-    print("[PLAY] aplay", OUT_WAV)
-    subprocess.check_call(["aplay", str(OUT_WAV)])
+# Persistent Piper: a fresh piper process per utterance reloads the ONNX
+# model and re-initializes the onnxruntime session each time. One process
+# with the line-oriented JSON stdin protocol keeps the model resident; a
+# pump thread copies its raw PCM into one long-lived aplay, so playback
+# still starts on the first synthesized samples (no staging WAV).
+_piper_proc = None
+_aplay_proc = None
+_pump_thread = None
+
+
+def _pump_pcm(src, dst):
+    while True:
+        chunk = src.read(4096)
+        if not chunk:
+            break
+        dst.write(chunk)
+        dst.flush()
+    try:
+        dst.close()
+    except Exception:
+        pass
+
+
+def _get_piper():
+    global _piper_proc, _aplay_proc, _pump_thread
+    if _piper_proc is None or _piper_proc.poll() is not None:
+        piper_cmd = ["piper", "-m", str(PIPER_MODEL), "-c", str(PIPER_CONFIG),
+                     "--output-raw", "--json-input"]
+        aplay_cmd = ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(PIPER_RATE), "-c", "1", "-"]
+        print("[TTS] starting", " ".join(piper_cmd), "|", " ".join(aplay_cmd))
+        _piper_proc = subprocess.Popen(piper_cmd, stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE, bufsize=0,
+                                       preexec_fn=_pin(TTS_CPUS))
+        _aplay_proc = subprocess.Popen(aplay_cmd, stdin=subprocess.PIPE,
+                                       preexec_fn=_pin(TTS_CPUS))
+        _pump_thread = threading.Thread(
+            target=_pump_pcm, args=(_piper_proc.stdout, _aplay_proc.stdin), daemon=True
+        )
+        _pump_thread.start()
+    return _piper_proc
+
+
+def speak(text: str):
+    piper = _get_piper()
+    piper.stdin.write((json.dumps({"text": text}) + "\n").encode())
+    piper.stdin.flush()
+
+
+def stop_piper():
+    """Close Piper's stdin and wait for the remaining audio to drain."""
+    global _piper_proc, _aplay_proc, _pump_thread
+    if _piper_proc is None:
+        return
+    try:
+        _piper_proc.stdin.close()
+    except Exception:
+        pass
+    _piper_proc.wait()
+    _pump_thread.join(timeout=30)
+    _aplay_proc.wait()
+    _piper_proc = _aplay_proc = _pump_thread = None
+
+# --- Streaming pipeline: LLM tokens -> sentences -> TTS -> speaker -------
+# The serial path pays sum(llm, tts, play); here the LLM streams tokens
+# (SSE), complete sentences are synthesized while later tokens arrive
+# (up to two Piper processes in flight), and playback of one sentence
+# overlaps synthesis of the next.
+
+_SENTENCE_ENDS = ".!?"
+_MAX_CLAUSE_CHARS = 80  # flush run-on clauses so TTS is never starved
+
+
+async def _synth(text: str, sem: asyncio.Semaphore) -> bytes:
+    async with sem:
+        piper = await asyncio.create_subprocess_exec(
+            "piper", "-m", str(PIPER_MODEL), "-c", str(PIPER_CONFIG), "--output-raw",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            preexec_fn=_pin(TTS_CPUS),
+        )
+        pcm, _ = await piper.communicate((text + "\n").encode())
+        return pcm
+
+
+async def _player(synth_q: asyncio.Queue) -> None:
+    aplay = await asyncio.create_subprocess_exec(
+        "aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(PIPER_RATE), "-c", "1", "-",
+        stdin=asyncio.subprocess.PIPE,
+        preexec_fn=_pin(TTS_CPUS),
+    )
+    try:
+        while True:
+            task = await synth_q.get()
+            if task is None:
+                break
+            pcm = await task
+            if pcm:
+                aplay.stdin.write(pcm)
+                await aplay.stdin.drain()
+    finally:
+        aplay.stdin.close()
+        await aplay.wait()
+
+
+async def _llm_stream(user_text: str, synth_q: asyncio.Queue, sem: asyncio.Semaphore) -> str:
+    print("[LLM] POST (stream)", LLM_URL)
+    proc = await asyncio.create_subprocess_exec(
+        "curl", "-sN", LLM_URL, "-H", "Content-Type: application/json",
+        "-d", _llm_body(_LLM_STREAM_TEMPLATE, user_text),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    buf = ""
+    pieces = []
+    try:
+        async for raw_line in proc.stdout:
+            line = raw_line.decode("utf-8", "replace").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            tok = json.loads(data)["choices"][0].get("delta", {}).get("content") or ""
+            if not tok:
+                continue
+            pieces.append(tok)
+            buf += tok
+            # Ship every complete sentence to TTS as soon as it closes.
+            while True:
+                cuts = [i for i in (buf.find(c) for c in _SENTENCE_ENDS) if i >= 0]
+                if not cuts:
+                    break
+                idx = min(cuts)
+                sentence, buf = buf[: idx + 1].strip(), buf[idx + 1 :]
+                if sentence:
+                    await synth_q.put(asyncio.create_task(_synth(sentence, sem)))
+            # No terminator yet but the clause is already long: flush at the
+            # last word break instead of waiting for punctuation.
+            if len(buf) > _MAX_CLAUSE_CHARS:
+                cut = buf.rfind(" ")
+                if cut > 0:
+                    clause, buf = buf[:cut].strip(), buf[cut + 1 :]
+                    if clause:
+                        await synth_q.put(asyncio.create_task(_synth(clause, sem)))
+        if buf.strip():
+            await synth_q.put(asyncio.create_task(_synth(buf.strip(), sem)))
+    finally:
+        await synth_q.put(None)
+        await proc.wait()
+
+    reply = " ".join("".join(pieces).split())
+    if not reply:
+        raise RuntimeError("LLM stream produced no tokens")
+    return reply
+
+
+async def converse(user_text: str) -> str:
+    synth_q: asyncio.Queue = asyncio.Queue(maxsize=8)
+    sem = asyncio.Semaphore(2)  # at most two Piper synths in flight
+    player = asyncio.create_task(_player(synth_q))
+    try:
+        reply = await _llm_stream(user_text, synth_q, sem)
+    finally:
+        await player
+    return reply
+
 
 def main():
     check_files()
     print("=== MIC -> STT -> LLM -> TTS -> SPEAKER ===")
-    record(5)
-    text = stt()
-    print("You said:", text)
-    reply = llm(text)
-    print("Assistant:", reply)
-    tts(reply)
-    play()
+    start_whisper_server()
+    try:
+        warmup = start_warmup()  # overlaps the user speaking
+        record(5)
+        warmup.join(timeout=30)
+        text = stt()
+        print("You said:", text)
+        try:
+            reply = asyncio.run(converse(text))
+            print("Assistant:", reply)
+        except Exception as e:
+            print(f"[PIPE] streaming pipeline failed ({e}); falling back to serial path")
+            reply = llm(text)
+            print("Assistant:", reply)
+            speak(reply)
+    finally:
+        stop_piper()  # waits for queued audio to finish playing
+        stop_whisper_server()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
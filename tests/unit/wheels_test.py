@@ -25,13 +25,24 @@ Optional:
 import time
 import argparse
 
-try:
-    from gpiozero import DigitalOutputDevice
-except ImportError:
-    raise SystemExit(
-        "Missing gpiozero. Install with:\n"
-        "  sudo apt update && sudo apt install -y python3-gpiozero\n"
-    )
+# gpiozero drags in lgpio/colorzero and costs hundreds of ms on a Pi, so
+# it is imported only when a motor class is actually constructed; arg
+# parsing (and --help) stays instant.
+_DigitalOutputDevice = None
+
+
+def _digital_output_device():
+    global _DigitalOutputDevice
+    if _DigitalOutputDevice is None:
+        try:
+            from gpiozero import DigitalOutputDevice
+        except ImportError:
+            raise SystemExit(
+                "Missing gpiozero. Install with:\n"
+                "  sudo apt update && sudo apt install -y python3-gpiozero\n"
+            )
+        _DigitalOutputDevice = DigitalOutputDevice
+    return _DigitalOutputDevice
 
 # ----------------------------
 # Pin mapping (BCM)
@@ -57,6 +68,7 @@ S_IB2 = 21
 
 class L298NWheels:
     def __init__(self, in1, in2, in3, in4):
+        DigitalOutputDevice = _digital_output_device()
         self.in1 = DigitalOutputDevice(in1, initial_value=False)
         self.in2 = DigitalOutputDevice(in2, initial_value=False)
         self.in3 = DigitalOutputDevice(in3, initial_value=False)
@@ -118,6 +130,7 @@ class L9110StepperTogether:
     so both stepper groups move together.
     """
     def __init__(self, ia1, ia2, ib1, ib2, invert=False):
+        DigitalOutputDevice = _digital_output_device()
         self.ia1 = DigitalOutputDevice(ia1, initial_value=False)
         self.ia2 = DigitalOutputDevice(ia2, initial_value=False)
         self.ib1 = DigitalOutputDevice(ib1, initial_value=False)